@@ -83,7 +83,7 @@ for _, row in l1_candidates.iterrows():
 
     # === 因子 2: 外資持倉態度 (0-25 分) ===
     foreign_5d_avg = recent_5d['foreign_net'].mean()
-    foreign_latest = recent_5d.iloc[-1]['foreign_net']
+    foreign_latest = recent_5d['foreign_net'].iat[-1]
 
     if foreign_5d_avg > 1000 and foreign_latest > 0:
         chip_score += 25
@@ -125,8 +125,8 @@ for _, row in l1_candidates.iterrows():
     # === 因子 5: 大戶持股趨勢 (0-10 分) ===
     share_df = data_manager.read_shareholding_data(symbol)
     if not share_df.empty and len(share_df) >= 2:
-        latest_ratio = share_df.iloc[-1]['major_ratio']
-        prev_ratio = share_df.iloc[-2]['major_ratio']
+        latest_ratio = share_df['major_ratio'].iat[-1]
+        prev_ratio = share_df['major_ratio'].iat[-2]
         ratio_change = latest_ratio - prev_ratio
 
         if ratio_change > 0.5:
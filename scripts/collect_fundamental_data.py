@@ -369,7 +369,8 @@ def collect_fundamental_data(
     data_manager: ParquetManager,
     start_date: str,
     end_date: str,
-    skip_existing: bool = True
+    skip_existing: bool = True,
+    bulk: bool = False
 ) -> tuple[int, int]:
     """
     批次收集基本面數據
@@ -381,6 +382,8 @@ def collect_fundamental_data(
         start_date: Start date for data collection
         end_date: End date for data collection
         skip_existing: Skip symbols that already have data
+        bulk: Fetch each dataset for all stocks in one request (requires a token
+            with whole-market access) instead of one request per stock
         
     Returns:
         (success_count, failure_count) tuple
@@ -401,17 +404,26 @@ def collect_fundamental_data(
     
     success_count = 0
     failure_count = 0
+
+    # 全市場模式：每份報表只發一次請求，之後依 symbol 取用
+    bulk_data = (
+        finmind_client.get_comprehensive_fundamentals_bulk(symbols, start_date, end_date)
+        if bulk else None
+    )
     
     # Progress bar
     with tqdm(total=len(symbols), desc="Collecting fundamental data", unit="stock") as pbar:
         for symbol in symbols:
             try:
                 # Fetch comprehensive fundamental data
-                data = finmind_client.get_comprehensive_fundamentals(
-                    symbol=symbol,
-                    start_date=start_date,
-                    end_date=end_date
-                )
+                if bulk_data is not None:
+                    data = bulk_data[symbol]
+                else:
+                    data = finmind_client.get_comprehensive_fundamentals(
+                        symbol=symbol,
+                        start_date=start_date,
+                        end_date=end_date
+                    )
                 
                 # Merge data sources
                 merged_data = merge_fundamental_data(data)
@@ -475,6 +487,11 @@ def main():
         nargs='+',
         help='Specific symbols to download (e.g., --symbols 2330 2317)'
     )
+    parser.add_argument(
+        '--bulk',
+        action='store_true',
+        help='Fetch each dataset for the whole market in one request (requires a sponsor-tier token)'
+    )
     
     args = parser.parse_args()
     
@@ -495,7 +512,11 @@ def main():
         config = load_api_config()
         
         # Initialize clients
-        finmind_client = FinMindClient(api_token=config['finmind']['token'])
+        # 查詢結果快取於磁碟：重跑時已抓過的歷史區間不再呼叫 API
+        finmind_client = FinMindClient(
+            api_token=config['finmind']['token'],
+            cache_dir=Path('.cache') / 'finmind'
+        )
         data_manager = ParquetManager(base_path='data')
         
         # Calculate date range
@@ -523,7 +544,8 @@ def main():
             data_manager=data_manager,
             start_date=start_date,
             end_date=end_date,
-            skip_existing=not args.force
+            skip_existing=not args.force,
+            bulk=args.bulk
         )
         
         # Summary
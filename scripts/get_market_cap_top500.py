@@ -10,6 +10,7 @@
 
 import sys
 import os
+import numpy as np
 import pandas as pd
 import logging
 import argparse
@@ -86,15 +87,17 @@ def get_top_500(client: FinMindClient, date: str = None) -> pd.DataFrame:
 
     # 4. 合併並處理
     all_data = pd.concat(market_values, ignore_index=True)
+    # 日期一次轉為 datetime64，後續的 max 與等值過濾為 int64 比較而非字串比較
+    all_data['date'] = pd.to_datetime(all_data['date'], format='%Y-%m-%d')
     latest_date = all_data['date'].max()
-    logger.info(f"使用最新日期資料: {latest_date}")
+    logger.info(f"使用最新日期資料: {latest_date.date()}")
     
-    latest_data = all_data[all_data['date'] == latest_date].copy()
-    latest_data = latest_data.sort_values('market_value', ascending=False)
+    latest_data = all_data[all_data['date'] == latest_date]
     
     # 5. 加入股票名稱與排名
-    top_500 = latest_data.head(500).copy()
-    top_500['rank'] = range(1, len(top_500) + 1)
+    # nlargest 為部分排序 (O(N log k))，免去對全部股票完整排序後再截斷
+    top_500 = latest_data.nlargest(500, 'market_value').copy()
+    top_500['rank'] = np.arange(1, len(top_500) + 1, dtype=np.uint16)
     
     top_500 = top_500.merge(
         stock_info[['stock_id', 'stock_name']],
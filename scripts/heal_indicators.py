@@ -3,6 +3,7 @@ import os
 import sys
 import logging
 import pandas as pd
+import pyarrow.parquet as pq
 from pathlib import Path
 from typing import List, Set, Dict
 from tqdm import tqdm
@@ -30,6 +31,13 @@ def get_target_symbols() -> List[str]:
                         symbols.append(parts[0])
     return symbols
 
+def _symbols_with_data(root: Path) -> Set[str]:
+    """掃描 symbol=XXXX 分區目錄，回傳已有 data.parquet 的股票代碼"""
+    return {p.parent.name.split('=', 1)[1] for p in root.glob('symbol=*/data.parquet')}
+
+# find_gaps 檢查最新一季是否缺漏的指標欄位
+GAP_CHECK_COLUMNS = ('net_income', 'operating_cash_flow')
+
 def find_gaps(symbols: List[str], data_manager: ParquetManager) -> Dict[str, Set[str]]:
     """找出遺漏指標的股票"""
     gaps = {
@@ -49,36 +57,59 @@ def find_gaps(symbols: List[str], data_manager: ParquetManager) -> Dict[str, Set
             gaps['operating_cash_flow'].add(symbol)
         else:
             try:
-                df = pd.read_parquet(fund_p)
-                if df.empty:
+                # 僅讀取 footer 與最後一個 row group 的目標欄位，避免整檔載入
+                pf = pq.ParquetFile(fund_p)
+                if pf.metadata.num_rows == 0:
                     gaps['fundamental_file'].add(symbol)
                     gaps['net_income'].add(symbol)
                     gaps['operating_cash_flow'].add(symbol)
                 else:
-                    latest = df.iloc[-1]
-                    if 'net_income' not in df.columns or pd.isna(latest['net_income']):
-                        gaps['net_income'].add(symbol)
-                    if 'operating_cash_flow' not in df.columns or pd.isna(latest['operating_cash_flow']):
-                        gaps['operating_cash_flow'].add(symbol)
+                    names = set(pf.schema_arrow.names)
+                    check_cols = [c for c in GAP_CHECK_COLUMNS if c in names]
+                    latest = {}
+                    if check_cols:
+                        last_rg = pf.read_row_group(pf.num_row_groups - 1, columns=check_cols)
+                        latest = {c: last_rg.column(c)[-1].as_py() for c in check_cols}
+                    for col in GAP_CHECK_COLUMNS:
+                        # 欄位不存在時直接短路；否則 None / NaN (v != v) 皆視為缺漏
+                        value = latest.get(col)
+                        if value is None or value != value:
+                            gaps[col].add(symbol)
             except Exception:
                 gaps['fundamental_file'].add(symbol)
-        
-        # Chip gaps
-        if not Path(f'data/chips/symbol={symbol}/data.parquet').exists():
-            gaps['chip_file'].add(symbol)
-            
-        # Tech gaps
-        if not Path(f'data/history/symbol={symbol}/data.parquet').exists():
-            gaps['tech_file'].add(symbol)
+
+    # Chip / Tech gaps: 各目錄掃描一次後以集合差集判斷，取代逐檔 exists()
+    wanted = set(symbols)
+    gaps['chip_file'] = wanted - _symbols_with_data(data_manager.chips_path)
+    gaps['tech_file'] = wanted - _symbols_with_data(data_manager.history_path)
             
     return gaps
 
+# 本地修復標記檔：記錄上次修復後檔案的 (mtime_ns, size)，檔案未變動即跳過
+HEALED_MARKER = '.healed_v1'
+
+def _file_signature(p: Path) -> str:
+    st = p.stat()
+    return f"{st.st_mtime_ns} {st.st_size}"
+
+def _is_already_healed(p: Path) -> bool:
+    marker = p.parent / HEALED_MARKER
+    try:
+        return marker.read_text(encoding='utf-8').strip() == _file_signature(p)
+    except OSError:
+        return False
+
+def _mark_healed(p: Path) -> None:
+    (p.parent / HEALED_MARKER).write_text(_file_signature(p), encoding='utf-8')
+
 def apply_local_fixes(symbols: List[str]):
     """套用本地數據修復（如金融股映射）"""
     print("Applying local data fixes...")
     for s in tqdm(symbols, desc="Healing locals"):
         p = Path(f'data/fundamentals/symbol={s}/data.parquet')
         if p.exists():
+            if _is_already_healed(p):
+                continue
             try:
                 df = pd.read_parquet(p)
                 modified = False
@@ -114,6 +145,7 @@ def apply_local_fixes(symbols: List[str]):
 
                 if modified:
                     df.to_parquet(p, index=False)
+                _mark_healed(p)
             except Exception:
                 continue
 
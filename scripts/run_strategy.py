@@ -19,14 +19,16 @@ from datetime import datetime, date
 from pathlib import Path
 
 from src.parquet_manager import ParquetManager
-from src.factors import FactorEngine
-from src.screener import StockScreener
-from src.notification import NotificationService
 
 def run_stock_screening():
     """
     執行選股策略
     """
+    # 延遲載入較重的模組，避免 CLI 啟動時的額外成本
+    from src.factors import FactorEngine
+    from src.screener import StockScreener
+    from src.notification import NotificationService
+
     # 1. 設置路徑
     base_dir = Path(__file__).parent.parent
     report_dir = base_dir / 'reports' / 'selections'
@@ -34,7 +36,12 @@ def run_stock_screening():
     
     # 2. 初始化組件
     data_manager = ParquetManager(base_path='data')
-    factor_engine = FactorEngine(data_manager=data_manager)
+    # 因子原始值儲存：同日重跑時財報與股價皆未變動的股票不重新計算
+    # (指紋含具 PE 股票的每日股價，新交易日多數股票仍需重算)
+    factor_engine = FactorEngine(
+        data_manager=data_manager,
+        score_store_path=base_dir / '.cache' / 'factor_scores.parquet'
+    )
     screener = StockScreener(factor_engine=factor_engine, data_manager=data_manager)
     
     # 載入 API 密鑰用於通知
@@ -55,7 +62,12 @@ def run_stock_screening():
             logger.error("找不到歷史數據目錄，請先執行 update_data.py")
             return
             
-        universe = [d.name.split('=')[1] for d in history_path.iterdir() if d.is_dir() and 'symbol=' in d.name]
+        # os.scandir 直接使用目錄項目的 d_type，免去每個子目錄的 stat()
+        with os.scandir(history_path) as entries:
+            universe = sorted(
+                e.name.split('=', 1)[1] for e in entries
+                if e.name.startswith('symbol=') and e.is_dir(follow_symlinks=False)
+            )
         
         if not universe:
             logger.warning("股票池為空，可能尚未下載數據。")
@@ -63,6 +75,7 @@ def run_stock_screening():
 
         # 4. 執行篩選
         results_df = screener.screen_stocks(universe=universe)
+        factor_engine.flush_cache()
         
         if results_df.empty:
             msg = f"📉 {date.today()} 選股結束：今日無符合條件的股票。"
@@ -80,19 +93,27 @@ def run_stock_screening():
         # 6. 構造通知訊息
         strong_buys = results_df[results_df['signal'] == 'STRONG_BUY']
         
-        msg = f"🚀 <b>FinGear 選股日報 ({today_str})</b>\n\n"
-        msg += f"共選出 {len(results_df)} 檔潛力股\n"
-        
         if not strong_buys.empty:
-            msg += "\n🔥 <b>今日熱門 (STRONG_BUY):</b>\n"
-            for _, row in strong_buys.iterrows():
-                msg += f"• <code>{row['symbol']}</code> Score: {row['fundamental_score']:.1f} | Bias: {row['bias_60']:.2f}%\n"
+            section_title = "🔥 <b>今日熱門 (STRONG_BUY):</b>"
+            lines = [
+                f"• <code>{row.symbol}</code> Score: {row.fundamental_score:.1f} | Bias: {row.bias_60:.2f}%"
+                for row in strong_buys.itertuples(index=False)
+            ]
         else:
-            msg += "\n📋 <b>今日精選 (前 3 名):</b>\n"
-            for _, row in results_df.head(3).iterrows():
-                msg += f"• <code>{row['symbol']}</code> {row['signal']} | Score: {row['fundamental_score']:.1f}\n"
-
-        msg += f"\n完整清單已儲存於 CSV 報表。"
+            section_title = "📋 <b>今日精選 (前 3 名):</b>"
+            lines = [
+                f"• <code>{row.symbol}</code> {row.signal} | Score: {row.fundamental_score:.1f}"
+                for row in results_df.head(3).itertuples(index=False)
+            ]
+        body = "\n".join(lines)
+
+        msg = (
+            f"🚀 <b>FinGear 選股日報 ({today_str})</b>\n\n"
+            f"共選出 {len(results_df)} 檔潛力股\n"
+            f"\n{section_title}\n"
+            f"{body}\n"
+            f"\n完整清單已儲存於 CSV 報表。"
+        )
         
         if notifier:
             notifier.send_telegram(msg)
@@ -16,16 +16,14 @@ import json
 import sys
 from datetime import datetime, time
 from pathlib import Path
-from apscheduler.schedulers.blocking import BlockingScheduler
-from apscheduler.triggers.cron import CronTrigger
-import pytz
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.parquet_manager import ParquetManager
-from scripts.collect_fundamental_data import collect_fundamental_data, get_stock_universe, calculate_date_range
-from src.finmind_client import FinMindClient
+
+# 注意：apscheduler、FinMind 等較重的依賴延遲至實際使用時才載入，
+# 以縮短排程器與單次任務的啟動時間
 
 
 class DataUpdateScheduler:
@@ -45,6 +43,9 @@ class DataUpdateScheduler:
         self.logger = logging.getLogger(__name__)
         self.config = self._load_config(config_path)
         self.data_manager = ParquetManager(base_path='data')
+
+        from apscheduler.schedulers.blocking import BlockingScheduler
+        import pytz
         self.scheduler = BlockingScheduler(timezone=pytz.timezone('Asia/Taipei'))
         
         # 統計計數器
@@ -102,6 +103,9 @@ class DataUpdateScheduler:
         self.logger.info("開始更新基本面數據")
         
         try:
+            from src.finmind_client import FinMindClient
+            from scripts.collect_fundamental_data import calculate_date_range
+
             # 初始化 FinMind client
             finmind_client = FinMindClient(api_token=self.config['finmind']['token'])
             
@@ -241,6 +245,7 @@ class DataUpdateScheduler:
     
     def setup_schedules(self):
         """設定所有排程任務"""
+        from apscheduler.triggers.cron import CronTrigger
         
         # 1. 每小時整點：檢查並更新價格數據（僅交易時間）
         self.scheduler.add_job(
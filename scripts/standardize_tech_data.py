@@ -1,6 +1,7 @@
 
 import pandas as pd
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import tqdm
 import sys
 
@@ -9,6 +10,34 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.parquet_manager import ParquetManager
 
+# Define standard column mapping
+# We want: open, high, low, close, volume, amount, date, symbol/stock_id
+COLUMN_MAPPING = {
+    'Trading_Volume': 'volume',
+    'max': 'high',
+    'min': 'low',
+    'stock_id': 'symbol',
+    'Trading_money': 'amount'
+}
+
+# Parquet 讀寫期間 pyarrow 會釋放 GIL，以執行緒池併發批次寫入
+MAX_WRITE_WORKERS = 8
+
+
+def _standardize_file(data_file: Path) -> bool:
+    """標準化單一歷史檔案欄位，僅在有欄位需要重新命名時才回寫"""
+    df = pd.read_parquet(data_file)
+
+    # Rename columns if they exist
+    cols_to_rename = {k: v for k, v in COLUMN_MAPPING.items() if k in df.columns}
+    if not cols_to_rename:
+        return False
+
+    # Save back
+    df.rename(columns=cols_to_rename).to_parquet(data_file)
+    return True
+
+
 def standardize_history():
     data_manager = ParquetManager(base_path='data')
     history_path = data_manager.history_path
@@ -17,36 +46,22 @@ def standardize_history():
         print("History directory not found.")
         return
 
-    # Define standard column mapping
-    # We want: open, high, low, close, volume, amount, date, symbol/stock_id
-    column_mapping = {
-        'Trading_Volume': 'volume',
-        'max': 'high',
-        'min': 'low',
-        'stock_id': 'symbol',
-        'Trading_money': 'amount'
-    }
-
-    symbol_dirs = list(history_path.glob('symbol=*'))
-    print(f"Standardizing {len(symbol_dirs)} history files...")
-
-    for symbol_dir in tqdm.tqdm(symbol_dirs):
-        data_file = symbol_dir / 'data.parquet'
-        if not data_file.exists():
-            continue
-            
-        try:
-            df = pd.read_parquet(data_file)
-            
-            # Rename columns if they exist
-            cols_to_rename = {k: v for k, v in column_mapping.items() if k in df.columns}
-            if cols_to_rename:
-                df = df.rename(columns=cols_to_rename)
-            
-            # Save back
-            df.to_parquet(data_file)
-        except Exception as e:
-            print(f"Error standardizing {symbol_dir.name}: {e}")
+    data_files = [d / 'data.parquet' for d in history_path.glob('symbol=*')]
+    data_files = [f for f in data_files if f.exists()]
+    print(f"Standardizing {len(data_files)} history files...")
+
+    rewritten = 0
+    with ThreadPoolExecutor(max_workers=MAX_WRITE_WORKERS) as executor:
+        future_to_file = {executor.submit(_standardize_file, f): f for f in data_files}
+        for future in tqdm.tqdm(as_completed(future_to_file), total=len(future_to_file)):
+            data_file = future_to_file[future]
+            try:
+                if future.result():
+                    rewritten += 1
+            except Exception as e:
+                print(f"Error standardizing {data_file.parent.name}: {e}")
+
+    print(f"Rewrote {rewritten} files, {len(data_files) - rewritten} already standard.")
 
 if __name__ == "__main__":
     standardize_history()
@@ -1,12 +1,19 @@
 
+import sys
 import requests
-import json
 from pathlib import Path
 
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils import json_loads, load_config
+
+# FinMind 請求共用的 Session (keep-alive)
+_session = requests.Session()
+
 def test_finmind():
     config_path = Path('config/api_keys.json')
-    with open(config_path, 'r') as f:
-        config = json.load(f)
+    config = load_config(config_path)
     
     token = config['finmind']['token']
     
@@ -19,10 +26,10 @@ def test_finmind():
         "token": token
     }
     
-    response = requests.get(url, params=params)
+    response = _session.get(url, params=params)
     print(f"Status Code: {response.status_code}")
     try:
-        data = response.json()
+        data = json_loads(response.content)
         print("Response JSON keys:", data.keys())
         if "msg" in data:
             print("Message:", data["msg"])
@@ -1,5 +1,12 @@
-import requests
-import pandas as pd
+import sys
+from pathlib import Path
+import pyarrow as pa
+import pyarrow.compute as pc
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.twse import session, parse_response, as_list, rows_to_table
+
 
 def get_twse_mi_mar_cap(date_str: str):
     url = f"https://www.twse.com.tw/rwd/zh/afterTrading/MI_MAR_CAP?date={date_str}&response=json"
@@ -7,8 +14,8 @@ def get_twse_mi_mar_cap(date_str: str):
     headers = {"User-Agent": "Mozilla/5.0"}
     
     try:
-        response = requests.get(url, headers=headers)
-        data = response.json()
+        response = session.get(url, headers=headers)
+        data = parse_response(response.content)
         if data.get('stat') != 'OK':
             print(f"TWSE returned: {data.get('stat')}")
             return None
@@ -17,20 +24,21 @@ def get_twse_mi_mar_cap(date_str: str):
             fields = table.get('fields', [])
             if '證券代號' in fields and '市值(百萬元)' in fields:
                 print(f"Found market cap table at index {i}")
-                df = pd.DataFrame(table.get('data', []), columns=fields)
-                return df
+                return rows_to_table(as_list(fields), as_list(table.get('data', [])))
         return None
     except Exception as e:
         print(f"Exception: {e}")
         return None
 
-df = get_twse_mi_mar_cap("20251231")
-if df is not None:
-    print(f"Success! Columns: {df.columns.tolist()}")
+tbl = get_twse_mi_mar_cap("20251231")
+if tbl is not None:
+    print(f"Success! Columns: {tbl.column_names}")
     print("Top 10 by Market Cap (after cleaning):")
-    # Clean up commas and convert to numeric
-    df['市值(百萬元)'] = df['市值(百萬元)'].str.replace(',', '').astype(float)
-    df = df.sort_values('市值(百萬元)', ascending=False)
-    print(df.head(10))
+    # Clean up commas and convert to numeric (Arrow compute kernels, no Python loop)
+    col = '市值(百萬元)'
+    cleaned = pc.cast(pc.replace_substring(tbl[col], ',', ''), pa.float64())
+    tbl = tbl.set_column(tbl.column_names.index(col), col, cleaned)
+    tbl = tbl.sort_by([(col, 'descending')])
+    print(tbl.slice(0, 10).to_pandas())
 else:
     print("Failed to get data.")
@@ -1,11 +1,19 @@
+import sys
 import requests
 import json
 from pathlib import Path
 
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils import json_loads, load_config
+
+# FinMind 請求共用的 Session (keep-alive)
+_session = requests.Session()
+
 # Load config to get token
 config_path = Path("config/api_keys.json")
-with open(config_path, "r") as f:
-    config = json.load(f)
+config = load_config(config_path)
 token = config.get("finmind", {}).get("token", "")
 
 url = "https://api.finmindtrade.com/api/v4/data"
@@ -19,10 +27,10 @@ params = {
 }
 
 print(f"Requesting: {url} with params {params}")
-response = requests.get(url, params=params)
+response = _session.get(url, params=params)
 print(f"Status Code: {response.status_code}")
 try:
-    data = response.json()
+    data = json_loads(response.content)
     print(f"Response JSON: {json.dumps(data, indent=2, ensure_ascii=False)}")
 except Exception as e:
     print(f"Failed to parse JSON: {e}")
@@ -1,11 +1,15 @@
+import sys
 from FinMind.data import DataLoader
-import json
 from pathlib import Path
 
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils import load_config
+
 # Load config to get token
 config_path = Path("config/api_keys.json")
-with open(config_path, "r") as f:
-    config = json.load(f)
+config = load_config(config_path)
 token = config.get("finmind", {}).get("token", "")
 
 print(f"Testing token: {token[:5]}...{token[-5:]}")
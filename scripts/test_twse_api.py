@@ -1,8 +1,12 @@
-import requests
-import json
-import pandas as pd
+import sys
+from pathlib import Path
 from datetime import datetime, timedelta
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.twse import session, parse_response, as_list, rows_to_table
+
+
 def get_twse_market_value(date_str: str):
     """
     Fetch market value info from TWSE MI_INDEX
@@ -16,12 +20,12 @@ def get_twse_market_value(date_str: str):
     }
     
     try:
-        response = requests.get(url, headers=headers)
+        response = session.get(url, headers=headers)
         if response.status_code != 200:
             print(f"Error: {response.status_code}")
             return None
         
-        data = response.json()
+        data = parse_response(response.content)
         if data.get('stat') != 'OK':
             print(f"TWSE returned non-OK status for {date_str}: {data.get('stat')}")
             return None
@@ -32,7 +36,8 @@ def get_twse_market_value(date_str: str):
             fields = table.get('fields', [])
             if '證券代號' in fields and '證券名稱' in fields:
                 print(f"Found stock table at index {i}")
-                df = pd.DataFrame(table.get('data', []), columns=fields)
+                tbl = rows_to_table(as_list(fields), as_list(table.get('data', [])))
+                df = tbl.to_pandas()
                 return df
                 
         return None
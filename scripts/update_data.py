@@ -13,7 +13,6 @@
 """
 
 import logging
-import json
 import os
 import pandas as pd
 from datetime import datetime, date, timedelta
@@ -23,7 +22,26 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from src.api_client import ShioajiClient
 from src.parquet_manager import ParquetManager
 from src.scrapers import ChipDataScraper
-from src.utils import setup_logging
+from src.utils import setup_logging, load_config
+
+# 逐檔抓取的並行上限；實際請求速率仍由 ShioajiClient 的 RateLimiter 控制
+MAX_FETCH_WORKERS = 16
+
+def _fetch_historical_concurrently(client: ShioajiClient, symbols: list, target_date: str) -> list:
+    """逐檔並行抓取指定日期行情 (snapshots 不支援歷史日期時的備援路徑)"""
+    logger = logging.getLogger(__name__)
+    all_data = []
+    with ThreadPoolExecutor(max_workers=max(1, min(MAX_FETCH_WORKERS, len(symbols)))) as executor:
+        future_to_symbol = {executor.submit(client.get_historical_data, s, target_date, target_date): s for s in symbols}
+        for future in as_completed(future_to_symbol):
+            symbol = future_to_symbol[future]
+            try:
+                df = future.result()
+                if not df.empty:
+                    all_data.append(df)
+            except Exception as exc:
+                logger.error(f"{symbol} 抓取失敗: {exc}")
+    return all_data
 
 def daily_update(target_date: str = None):
     """
@@ -37,8 +55,7 @@ def daily_update(target_date: str = None):
 
     # 1. 載入配置
     config_path = Path('config/api_keys.json')
-    with open(config_path, 'r') as f:
-        keys = json.load(f)
+    keys = load_config(config_path)
     
     api_key = keys['shioaji']['api_key']
     secret_key = keys['shioaji']['secret_key']
@@ -53,8 +70,7 @@ def daily_update(target_date: str = None):
         logger.info("正在抓取法人買賣超數據...")
         inst_df = scraper.scrape_institutional_trades(target_date)
         if not inst_df.empty:
-            for symbol, group in inst_df.groupby('symbol'):
-                manager.write_chip_data(symbol, group)
+            manager.write_chip_data_bulk(inst_df)
             logger.info("法人買賣超數據更新完成")
 
         # 每週五或週末抓取集保大戶 (一週更新一次)
@@ -62,8 +78,7 @@ def daily_update(target_date: str = None):
         logger.info("正在抓取大戶持股數據...")
         share_df = scraper.scrape_tdcc_shareholding()
         if not share_df.empty:
-            for symbol, group in share_df.groupby('symbol'):
-                manager.write_shareholding_data(symbol, group)
+            manager.write_shareholding_data_bulk(share_df)
             logger.info("大戶持股數據更新完成")
 
         # --- 4. 抓取日行情 (Shioaji) ---
@@ -72,17 +87,14 @@ def daily_update(target_date: str = None):
             symbols = ["2330", "2317", "2454", "2308", "2303", "2881", "2882"] 
             logger.info(f"準備從 Shioaji 抓取 {len(symbols)} 檔股票數據")
 
-            all_data = []
-            with ThreadPoolExecutor(max_workers=5) as executor:
-                future_to_symbol = {executor.submit(client.get_historical_data, s, target_date, target_date): s for s in symbols}
-                for future in as_completed(future_to_symbol):
-                    symbol = future_to_symbol[future]
-                    try:
-                        df = future.result()
-                        if not df.empty:
-                            all_data.append(df)
-                    except Exception as exc:
-                        logger.error(f"{symbol} 抓取失敗: {exc}")
+            if target_date == date.today().strftime("%Y-%m-%d"):
+                # 當日行情：snapshots 批次請求，一次往返取得所有股票；
+                # 非交易日快照為上一交易日行情，依日期過濾後為空
+                snapshot_df = client.get_daily_snapshots(symbols, trade_date=target_date)
+                all_data = [snapshot_df] if not snapshot_df.empty else []
+            else:
+                # 歷史日期無批次 API，退回逐檔並行抓取
+                all_data = _fetch_historical_concurrently(client, symbols, target_date)
 
             if not all_data:
                 logger.warning(f"{target_date} 沒有抓取到價格數據，可能為非交易日。")
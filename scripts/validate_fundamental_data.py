@@ -10,11 +10,15 @@
 參考：Implementation Plan - Data Quality Monitoring
 """
 
+import os
 import sys
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 import logging
 
 # Add project root to path
@@ -22,6 +26,49 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.parquet_manager import ParquetManager
 
+# numba 為選用依賴：安裝時以 JIT 編譯的單次迴圈計數，否則退回 NumPy 向量運算
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+_EMPTY = np.empty(0, dtype=np.float64)
+
+
+def _count_anomalies_numpy(revenue, equity, total_assets, eps):
+    """計算 (負營收, 非正權益, 非正資產, 極端 EPS) 的季度數"""
+    return (
+        int(np.count_nonzero(revenue < 0)),
+        int(np.count_nonzero(equity <= 0)),
+        int(np.count_nonzero(total_assets <= 0)),
+        int(np.count_nonzero((eps > 100) | (eps < -50))),
+    )
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _count_anomalies(revenue, equity, total_assets, eps):
+        """_count_anomalies_numpy 的 Numba 版本 (NaN 比較皆為 False，與 NumPy 一致)"""
+        neg_rev = 0
+        for v in revenue:
+            if v < 0:
+                neg_rev += 1
+        bad_eq = 0
+        for v in equity:
+            if v <= 0:
+                bad_eq += 1
+        bad_ta = 0
+        for v in total_assets:
+            if v <= 0:
+                bad_ta += 1
+        ext_eps = 0
+        for v in eps:
+            if v > 100 or v < -50:
+                ext_eps += 1
+        return neg_rev, bad_eq, bad_ta, ext_eps
+else:
+    _count_anomalies = _count_anomalies_numpy
+
 
 class FundamentalDataValidator:
     """基本面數據驗證器"""
@@ -37,6 +84,11 @@ class FundamentalDataValidator:
     
     MIN_QUARTERS = 5  # 至少需要 5 個季度的數據（供 YoY 計算）
     
+    VALIDATE_CHUNKSIZE = 16  # 每個工作行程一次領取的股票數
+    
+    # _check_anomalies 需要檢查數值範圍的欄位
+    ANOMALY_COLUMNS = ('revenue', 'equity', 'total_assets', 'eps')
+    
     def __init__(self, data_manager: ParquetManager):
         """
         初始化驗證器
@@ -61,13 +113,17 @@ class FundamentalDataValidator:
             self.logger.warning(f"Fundamentals directory not found: {fundamentals_path}")
             return []
         
+        # os.scandir 的 DirEntry 帶有目錄類型資訊，每個子目錄只需一次 stat 取得檔案大小
         stocks = []
-        for symbol_dir in fundamentals_path.iterdir():
-            if symbol_dir.is_dir() and symbol_dir.name.startswith('symbol='):
-                symbol = symbol_dir.name.split('=')[1]
-                data_file = symbol_dir / 'data.parquet'
-                if data_file.exists() and data_file.stat().st_size > 0:
-                    stocks.append(symbol)
+        with os.scandir(fundamentals_path) as entries:
+            for entry in entries:
+                if entry.name.startswith('symbol=') and entry.is_dir(follow_symlinks=False):
+                    data_file = os.path.join(entry.path, 'data.parquet')
+                    try:
+                        if os.path.getsize(data_file) > 0:
+                            stocks.append(entry.name.split('=', 1)[1])
+                    except OSError:
+                        continue
         
         return sorted(stocks)
     
@@ -92,6 +148,21 @@ class FundamentalDataValidator:
         }
         
         try:
+            # 先以 Parquet footer 統計值判斷；能證明無異常時不需讀取資料頁
+            file_path = self.data_manager.fundamentals_path / f"symbol={symbol}" / "data.parquet"
+            if file_path.exists():
+                metadata = pq.ParquetFile(file_path).metadata
+                # 季度數不足時結果必定無效，僅讀 footer 即可回傳
+                if metadata.num_rows < self.MIN_QUARTERS:
+                    result['quarters'] = metadata.num_rows
+                    result['anomalies'].append(
+                        'Empty DataFrame' if metadata.num_rows == 0
+                        else f'Insufficient data: {metadata.num_rows} quarters'
+                    )
+                    return result
+                if self._validate_from_metadata(metadata, result):
+                    return result
+            
             df = self.data_manager.read_fundamental_data(symbol)
             
             if df.empty:
@@ -108,11 +179,12 @@ class FundamentalDataValidator:
             
             # 檢查日期範圍
             if 'date' in df.columns:
-                df['date'] = pd.to_datetime(df['date'])
-                result['date_range'] = (
-                    df['date'].min().strftime('%Y-%m-%d'),
-                    df['date'].max().strftime('%Y-%m-%d')
-                )
+                # 財報日期為 YYYY-MM-DD 字串，指定格式走 C 解析快速路徑，免去逐筆推斷 (pandas 1.x 亦適用)
+                df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d')
+                # 轉為日精度 datetime64，str() 即為 ISO 日期，不經 strftime 的 locale 路徑
+                dates = df['date'].dropna().to_numpy(dtype='datetime64[D]')
+                if len(dates):
+                    result['date_range'] = (str(dates.min()), str(dates.max()))
             
             # 檢查數據異常
             self._check_anomalies(df, result)
@@ -130,6 +202,59 @@ class FundamentalDataValidator:
         
         return result
     
+    def _validate_from_metadata(self, metadata: pq.FileMetaData, result: Dict) -> bool:
+        """
+        僅以 Parquet footer 的欄位統計值 (min/max/null_count) 完成驗證
+        
+        統計值足以證明「無缺失值且所有數值檢查皆通過」時填入 result 並回傳 True；
+        任何統計值缺漏或可能有異常時回傳 False，由呼叫端退回完整讀取。
+        (NaN 於寫入時已由 pyarrow 轉為 null，因此 null_count 涵蓋缺失值)
+        
+        Args:
+            metadata: 財務數據 Parquet 檔案的 footer metadata
+            result: 驗證結果字典（成功時會被修改）
+        """
+        if metadata.num_rows == 0:
+            return False
+        
+        # 彙整各 row group 的欄位統計值
+        names = metadata.schema.to_arrow_schema().names
+        stats = {}
+        for i, name in enumerate(names):
+            col_min = col_max = None
+            for rg in range(metadata.num_row_groups):
+                st = metadata.row_group(rg).column(i).statistics
+                if st is None or not st.has_null_count or st.null_count > 0 or not st.has_min_max:
+                    return False
+                col_min = st.min if col_min is None else min(col_min, st.min)
+                col_max = st.max if col_max is None else max(col_max, st.max)
+            stats[name] = (col_min, col_max)
+        
+        # 與 _check_anomalies 相同的數值規則，需由 min/max 證明全數通過
+        checks = {
+            'revenue': lambda lo, hi: lo >= 0,
+            'equity': lambda lo, hi: lo > 0,
+            'total_assets': lambda lo, hi: lo > 0,
+            'eps': lambda lo, hi: lo >= -50 and hi <= 100,
+        }
+        for col, passes in checks.items():
+            if col in stats and not passes(*stats[col]):
+                return False
+        
+        existing_cols = set(names)
+        result['quarters'] = metadata.num_rows
+        result['missing_required'] = list(self.REQUIRED_COLUMNS - existing_cols)
+        result['missing_recommended'] = list(self.RECOMMENDED_COLUMNS - existing_cols)
+        if 'date' in stats:
+            result['date_range'] = tuple(
+                str(np.datetime64(v, 'D')) for v in stats['date']
+            )
+        result['valid'] = (
+            result['quarters'] >= self.MIN_QUARTERS and
+            len(result['missing_required']) == 0
+        )
+        return True
+    
     def _check_anomalies(self, df: pd.DataFrame, result: Dict):
         """
         檢測數據異常
@@ -138,44 +263,52 @@ class FundamentalDataValidator:
             df: 財務數據 DataFrame
             result: 驗證結果字典（會被修改）
         """
+        # 一次取出相關欄位為連續 float64 陣列，交由單一計數核心處理
+        # (缺少的欄位以空陣列代入，並略過對應檢查)
+        present = {c: c in df.columns for c in self.ANOMALY_COLUMNS}
+        arrays = [
+            np.ascontiguousarray(df[c].to_numpy(dtype=np.float64, na_value=np.nan))
+            if present[c] else _EMPTY
+            for c in self.ANOMALY_COLUMNS
+        ]
+        negative_revenue, invalid_equity, invalid_assets, extreme_eps = _count_anomalies(*arrays)
+        
         # 檢查營收負值
-        if 'revenue' in df.columns:
-            negative_revenue = (df['revenue'] < 0).sum()
-            if negative_revenue > 0:
-                result['anomalies'].append(f'CRITICAL: {negative_revenue} quarters with negative revenue')
+        if present['revenue'] and negative_revenue > 0:
+            result['anomalies'].append(f'CRITICAL: {negative_revenue} quarters with negative revenue')
         
         # 檢查股東權益為 0 或負值
-        if'equity' in df.columns:
-            invalid_equity = (df['equity'] <= 0).sum()
-            if invalid_equity > 0:
-                result['anomalies'].append(f'CRITICAL: {invalid_equity} quarters with zero/negative equity')
+        if present['equity'] and invalid_equity > 0:
+            result['anomalies'].append(f'CRITICAL: {invalid_equity} quarters with zero/negative equity')
         
         # 檢查總資產為 0 或負值
-        if 'total_assets' in df.columns:
-            invalid_assets = (df['total_assets'] <= 0).sum()
-            if invalid_assets > 0:
-                result['anomalies'].append(f'CRITICAL: {invalid_assets} quarters with zero/negative assets')
+        if present['total_assets'] and invalid_assets > 0:
+            result['anomalies'].append(f'CRITICAL: {invalid_assets} quarters with zero/negative assets')
         
         # 檢查 EPS 極端值（> 100 或 < -50）
-        if 'eps' in df.columns:
-            extreme_eps = ((df['eps'] > 100) | (df['eps'] < -50)).sum()
-            if extreme_eps > 0:
-                result['anomalies'].append(f'WARNING: {extreme_eps} quarters with extreme EPS values')
-        
-        # 檢查缺失值
-        null_counts = df.isnull().sum()
-        for col, count in null_counts.items():
+        if present['eps'] and extreme_eps > 0:
+            result['anomalies'].append(f'WARNING: {extreme_eps} quarters with extreme EPS values')
+        
+        # 檢查缺失值 (所有欄位一次計數)
+        null_counts = df.isna().to_numpy().sum(axis=0)
+        n_rows = len(df)
+        for col, count in zip(df.columns, null_counts):
             if count > 0:
-                pct = (count / len(df)) * 100
+                pct = (count / n_rows) * 100
                 if col in self.REQUIRED_COLUMNS:
                     result['anomalies'].append(f'CRITICAL: {col} has {count} NaN values ({pct:.1f}%)')
                 elif pct > 50:  # 超過 50% 缺失
                     result['anomalies'].append(f'WARNING: {col} has {count} NaN values ({pct:.1f}%)')
     
-    def validate_all(self) -> Dict:
+    def validate_all(self, max_workers: Optional[int] = None) -> Dict:
         """
         驗證所有股票並產生彙總報告
         
+        各股票驗證互相獨立，以多行程並行處理 (Parquet 讀取 + NumPy 檢查)
+        
+        Args:
+            max_workers: 行程數，預設為 CPU 核心數；設為 1 則循序執行
+        
         Returns:
             驗證彙總結果
         """
@@ -183,21 +316,35 @@ class FundamentalDataValidator:
         self.logger.info(f"Found {len(stocks)} stocks to validate")
         
         self.validation_results = []
-        for symbol in stocks:
-            result = self.validate_stock(symbol)
-            self.validation_results.append(result)
+        if max_workers == 1 or len(stocks) <= 1:
+            self.validation_results = [self.validate_stock(symbol) for symbol in stocks]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                self.validation_results = list(
+                    executor.map(self.validate_stock, stocks, chunksize=self.VALIDATE_CHUNKSIZE)
+                )
         
         # 彙總統計
-        summary = {
-            'total_stocks': len(stocks),
-            'valid_stocks': sum(1 for r in self.validation_results if r['valid']),
-            'invalid_stocks': sum(1 for r in self.validation_results if not r['valid']),
-            'average_quarters': sum(r['quarters'] for r in self.validation_results) / len(stocks) if stocks else 0,
-            'critical_issues': sum(1 for r in self.validation_results 
-                                   if any('CRITICAL' in a for a in r['anomalies']))
-        }
+        return self._summarize()
+    
+    def _summarize(self) -> Dict:
+        """以單次遍歷將驗證結果轉為 NumPy 陣列後彙總統計"""
+        results = self.validation_results
+        n = len(results)
+        valid = np.fromiter((r['valid'] for r in results), dtype=bool, count=n)
+        quarters = np.fromiter((r['quarters'] for r in results), dtype=np.int64, count=n)
+        critical = np.fromiter(
+            (any('CRITICAL' in a for a in r['anomalies']) for r in results), dtype=bool, count=n
+        )
+        valid_count = int(valid.sum())
         
-        return summary
+        return {
+            'total_stocks': n,
+            'valid_stocks': valid_count,
+            'invalid_stocks': n - valid_count,
+            'average_quarters': float(quarters.mean()) if n else 0,
+            'critical_issues': int(critical.sum())
+        }
     
     def generate_report(self, output_path: str = 'reports/data_quality_report.md'):
         """
@@ -209,56 +356,50 @@ class FundamentalDataValidator:
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
-        summary = {
-            'total_stocks': len(self.validation_results),
-            'valid_stocks': sum(1 for r in self.validation_results if r['valid']),
-            'invalid_stocks': sum(1 for r in self.validation_results if not r['valid']),
-            'average_quarters': (sum(r['quarters'] for r in self.validation_results) / 
-                                len(self.validation_results)) if self.validation_results else 0,
-            'critical_issues': sum(1 for r in self.validation_results 
-                                   if any('CRITICAL' in a for a in r['anomalies']))
-        }
+        summary = self._summarize()
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write('# 基本面數據質量報告\n\n')
-            f.write(f'**生成時間**: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}\n\n')
+        # 先於記憶體組裝所有內容，最後一次寫入
+        success_rate = (summary['valid_stocks'] / summary['total_stocks'] * 100) if summary['total_stocks'] > 0 else 0
+        parts = [
+            '# 基本面數據質量報告\n\n',
+            f'**生成時間**: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}\n\n',
             
             # 彙總統計
-            f.write('## 彙總統計\n\n')
-            f.write(f'- 總股票數: {summary["total_stocks"]}\n')
-            f.write(f'- 有效股票: {summary["valid_stocks"]} ✅\n')
-            f.write(f'- 無效股票: {summary["invalid_stocks"]} ❌\n')
-            f.write(f'- 平均季度數: {summary["average_quarters"]:.1f}\n')
-            f.write(f'- 嚴重問題數: {summary["critical_issues"]}\n\n')
-            
-            success_rate = (summary['valid_stocks'] / summary['total_stocks'] * 100) if summary['total_stocks'] > 0 else 0
-            f.write(f'**成功率**: {success_rate:.1f}%\n\n')
-            
-            # 有效股票列表
-            valid_stocks = [r for r in self.validation_results if r['valid']]
-            if valid_stocks:
-                f.write('\n## 有效股票列表\n\n')
-                f.write('| 股票代碼 | 季度數 | 日期範圍 |\n')
-                f.write('|---------|-------|----------|\n')
-                for r in valid_stocks:
-                    date_range = f"{r['date_range'][0]} ~ {r['date_range'][1]}" if r['date_range'] else 'N/A'
-                    f.write(f'| {r["symbol"]} | {r["quarters"]} | {date_range} |\n')
-            
-            # 無效或有問題的股票
-            invalid_stocks = [r for r in self.validation_results if not r['valid']]
-            if invalid_stocks:
-                f.write('\n## 無效或有問題的股票\n\n')
-                for r in invalid_stocks:
-                    f.write(f'\n### {r["symbol"]}\n\n')
-                    f.write(f'- 季度數: {r["quarters"]}\n')
-                    
-                    if r['missing_required']:
-                        f.write(f'- 缺少必要欄位: {", ".join(r["missing_required"])}\n')
-                    
-                    if r['anomalies']:
-                        f.write('- 異常:\n')
-                        for anomaly in r['anomalies']:
-                            f.write(f'  - {anomaly}\n')
+            '## 彙總統計\n\n',
+            f'- 總股票數: {summary["total_stocks"]}\n',
+            f'- 有效股票: {summary["valid_stocks"]} ✅\n',
+            f'- 無效股票: {summary["invalid_stocks"]} ❌\n',
+            f'- 平均季度數: {summary["average_quarters"]:.1f}\n',
+            f'- 嚴重問題數: {summary["critical_issues"]}\n\n',
+            f'**成功率**: {success_rate:.1f}%\n\n',
+        ]
+        
+        # 有效股票列表
+        valid_stocks = [r for r in self.validation_results if r['valid']]
+        if valid_stocks:
+            parts.append('\n## 有效股票列表\n\n')
+            parts.append('| 股票代碼 | 季度數 | 日期範圍 |\n')
+            parts.append('|---------|-------|----------|\n')
+            for r in valid_stocks:
+                date_range = f"{r['date_range'][0]} ~ {r['date_range'][1]}" if r['date_range'] else 'N/A'
+                parts.append(f'| {r["symbol"]} | {r["quarters"]} | {date_range} |\n')
+        
+        # 無效或有問題的股票
+        invalid_stocks = [r for r in self.validation_results if not r['valid']]
+        if invalid_stocks:
+            parts.append('\n## 無效或有問題的股票\n\n')
+            for r in invalid_stocks:
+                parts.append(f'\n### {r["symbol"]}\n\n')
+                parts.append(f'- 季度數: {r["quarters"]}\n')
+                
+                if r['missing_required']:
+                    parts.append(f'- 缺少必要欄位: {", ".join(r["missing_required"])}\n')
+                
+                if r['anomalies']:
+                    parts.append('- 異常:\n')
+                    parts.extend(f'  - {anomaly}\n' for anomaly in r['anomalies'])
+        
+        output_file.write_text(''.join(parts), encoding='utf-8')
         
         self.logger.info(f"Report generated: {output_file}")
         print(f'\n✓ 報告已生成: {output_file}')
@@ -10,7 +10,7 @@
 
 import sys
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Tuple
 import pandas as pd
 
 # Add project root to path
@@ -21,15 +21,20 @@ from src.parquet_manager import ParquetManager
 
 def load_stock_list(file_path: str) -> List[str]:
     """從 500_stocks.txt 載入股票清單"""
-    symbols = []
-    with open(file_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                parts = line.split()
-                if parts and parts[0].isdigit() and len(parts[0]) == 4:
-                    symbols.append(parts[0])
-    return symbols
+    # 一次讀入後以 pandas 字串向量運算取首欄並過濾 4 位數代碼
+    # (不用 read_csv：股票名稱可能含空白，欄位數不固定)
+    lines = pd.Series(Path(file_path).read_text(encoding='utf-8').splitlines(), dtype=object)
+    codes = lines.str.split(n=1).str[0]
+    return codes[codes.str.fullmatch(r'\d{4}', na=False)].tolist()
+
+
+def date_bounds(dates: pd.Series) -> Tuple[str, str]:
+    """回傳日期欄位的 (最早, 最晚) YYYY-MM-DD 字串；無有效日期時回傳 ('N/A', 'N/A')"""
+    # 一次解析為日精度 datetime64，str() 即為 ISO 日期 (不經 strftime 的 locale 路徑)
+    days = pd.to_datetime(dates, format='%Y-%m-%d').dropna().to_numpy(dtype='datetime64[D]')
+    if not len(days):
+        return 'N/A', 'N/A'
+    return str(days.min()), str(days.max())
 
 
 def check_data_availability(symbols: List[str], data_manager: ParquetManager) -> Dict:
@@ -49,7 +54,7 @@ def check_data_availability(symbols: List[str], data_manager: ParquetManager) ->
                 # 檢查數據完整性
                 record_count = len(df)
                 columns = list(df.columns)
-                date_range = f"{df['date'].min()} to {df['date'].max()}" if 'date' in df.columns else "N/A"
+                date_range = " to ".join(date_bounds(df['date'])) if 'date' in df.columns else "N/A"
                 
                 results['collected'].append(symbol)
                 results['details'].append({
@@ -137,7 +142,7 @@ def verify_data_structure(data_manager: ParquetManager, symbols: List[str]):
                 print(f"\n  {symbol}:")
                 print(f"    - 記錄數: {len(df)}")
                 print(f"    - 欄位: {', '.join(df.columns.tolist()[:8])}...")
-                print(f"    - 日期範圍: {df['date'].min()} ~ {df['date'].max()}")
+                print(f"    - 日期範圍: {' ~ '.join(date_bounds(df['date']))}")
                 
                 # 檢查資料型態
                 if 'eps' in df.columns:
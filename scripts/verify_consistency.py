@@ -7,9 +7,64 @@
 3. 設計模式註解是否正確
 """
 
-import re
+import ast
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-import yaml
+from typing import Dict, List, Tuple
+
+# 項目路徑 (模組載入時計算一次)
+project_root = Path(__file__).resolve().parent.parent
+CONFIG_PATH = project_root / 'config' / 'parameters.yaml'
+SRC_PATH = project_root / 'src'
+
+# 添加項目根目錄到 Python 路徑
+sys.path.insert(0, str(project_root))
+
+from src.utils.file_cache import read_text_cached
+from src.utils.yaml_cache import load_yaml_cached
+
+def _is_error_log_call(node: ast.Call) -> bool:
+    """是否為 logger.error(...) / self.logger.error(...) / logging.error(...) 呼叫"""
+    func = node.func
+    if not (isinstance(func, ast.Attribute) and func.attr == 'error'):
+        return False
+    owner = func.value
+    return ((isinstance(owner, ast.Name) and owner.id in ('logger', 'logging')) or
+            (isinstance(owner, ast.Attribute) and owner.attr == 'logger'))
+
+
+def _has_exc_info(node: ast.Call) -> bool:
+    """呼叫參數中是否有 exc_info=True (不論跨越幾行)"""
+    return any(
+        kw.arg == 'exc_info' and isinstance(kw.value, ast.Constant) and kw.value.value is True
+        for kw in node.keywords
+    )
+
+
+def _scan_file(path: str) -> Tuple[int, List[str]]:
+    """以 AST 掃描單一檔案，回傳 (錯誤日誌呼叫數, 缺少 exc_info=True 的問題列表)"""
+    py_file = Path(path)
+    source = py_file.read_text(encoding='utf-8')
+    calls = [
+        node for node in ast.walk(ast.parse(source, filename=path))
+        if isinstance(node, ast.Call) and _is_error_log_call(node)
+    ]
+
+    missing = sorted(node.lineno for node in calls if not _has_exc_info(node))
+    lines = source.splitlines() if missing else []
+    issues = [f"{py_file.name}:{lineno} - {lines[lineno - 1].strip()}" for lineno in missing]
+    return len(calls), issues
+
+
+def _extract_default_weights(content: str) -> Dict[str, float]:
+    """以 AST 取出 factors.py 中指派給 default_weights 的字面字典"""
+    for node in ast.walk(ast.parse(content)):
+        if (isinstance(node, ast.Assign) and isinstance(node.value, ast.Dict) and
+                any(isinstance(t, ast.Name) and t.id == 'default_weights' for t in node.targets)):
+            return {key: float(value) for key, value in ast.literal_eval(node.value).items()}
+    return {}
 
 
 def verify_factor_weights():
@@ -19,23 +74,16 @@ def verify_factor_weights():
     print("=" * 60)
 
     # 讀取 parameters.yaml
-    config_path = Path(__file__).parent.parent / 'config' / 'parameters.yaml'
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
+    config = load_yaml_cached(CONFIG_PATH)
 
     yaml_weights = config['screening']['factor_weights']
 
     # 讀取 factors.py 中的 default_weights
-    factors_path = Path(__file__).parent.parent / 'src' / 'factors.py'
-    with open(factors_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    factors_path = SRC_PATH / 'factors.py'
+    content = read_text_cached(factors_path)
 
     # 提取 default_weights
-    default_weights = {}
-    pattern = r"'(\w+)':\s*(0\.\d+)"
-    matches = re.findall(pattern, content[content.find("default_weights = {"):content.find("default_weights = {") + 500])
-    for key, value in matches:
-        default_weights[key] = float(value)
+    default_weights = _extract_default_weights(content)
 
     # 比較
     print("\n📊 因子權重對照表:")
@@ -65,24 +113,17 @@ def verify_error_logging():
     print("驗證 2: 錯誤日誌堆棧追蹤")
     print("=" * 60)
 
-    src_path = Path(__file__).parent.parent / 'src'
-
-    issues = []
-    total_errors = 0
-
-    for py_file in src_path.glob('*.py'):
-        with open(py_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+    # 各檔案互相獨立，以多行程並行掃描
+    with os.scandir(SRC_PATH) as it:
+        files = [entry.path for entry in it if entry.name.endswith('.py') and entry.is_file()]
+    if len(files) <= 1:
+        results = [_scan_file(f) for f in files]
+    else:
+        with ProcessPoolExecutor() as executor:
+            results = list(executor.map(_scan_file, files, chunksize=4))
 
-        for i, line in enumerate(lines, 1):
-            # 匹配 logger.error() 或 logging.error()
-            if re.search(r'\.(logger\.error|error)\(', line):
-                total_errors += 1
-                # 檢查是否有 exc_info=True
-                if 'exc_info=True' not in line:
-                    # 檢查下一行是否有 exc_info
-                    if i < len(lines) and 'exc_info=True' not in lines[i]:
-                        issues.append(f"{py_file.name}:{i} - {line.strip()}")
+    total_errors = sum(count for count, _ in results)
+    issues = [issue for _, file_issues in results for issue in file_issues]
 
     print(f"\n📝 總共發現 {total_errors} 個 logger.error() 調用")
 
@@ -138,9 +179,8 @@ def verify_design_patterns():
     all_match = True
 
     for check in checks:
-        file_path = Path(__file__).parent.parent / check['file']
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        file_path = project_root / check['file']
+        content = read_text_cached(file_path)
 
         # 在 class 定義附近搜索設計模式註解
         class_pos = content.find(f"class {check['class']}")
@@ -6,39 +6,61 @@
 
 import sys
 from pathlib import Path
-import yaml
-import re
+from typing import Dict, List, Set, Tuple
 
 # 添加項目根目錄到 Python 路徑
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from src.utils.file_cache import read_text_cached
+from src.utils.yaml_cache import load_yaml_cached
+
+# pyahocorasick 為選用依賴：每份文件單次掃描即找出所有字面檢查字串，未安裝時退回逐一 in 檢查
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# 依檢查字串組合快取已建好的 automaton
+_automata = {}
+
 
 def load_config_weights():
     """從配置文件載入權重"""
     config_path = project_root / 'config' / 'parameters.yaml'
 
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
-        return config['screening']['factor_weights']
+    config = load_yaml_cached(config_path)
+    return config['screening']['factor_weights']
 
 
-def check_claude_md():
-    """檢查 CLAUDE.md"""
-    file_path = project_root / 'CLAUDE.md'
+def _build_automaton(needles: Tuple[str, ...]):
+    automaton = ahocorasick.Automaton()
+    for needle in needles:
+        automaton.add_word(needle, needle)
+    automaton.make_automaton()
+    return automaton
 
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
 
-    checks = {
-        'PE Relative: **30%**': 'PE 估值權重 30%',
-        'ROE: 15%, EPS YoY: 15%': 'ROE 和 EPS YoY 各 15%',
-        'FCF: 10%': 'FCF 10%',
-    }
+def _find_literals(content: str, needles: Tuple[str, ...]) -> Set[str]:
+    """單次掃描文件內容，回傳出現過的字面字串 (需 pyahocorasick，否則逐一 in 檢查)"""
+    if not needles:
+        return set()
+    if ahocorasick is None:
+        return {needle for needle in needles if needle in content}
+    automaton = _automata.get(needles)
+    if automaton is None:
+        automaton = _automata[needles] = _build_automaton(needles)
+    return {needle for _, needle in automaton.iter(content)}
+
+
+def _run_checks(file_path: Path, checks: Dict[str, str]) -> List[Tuple[bool, str]]:
+    """對單一文件執行字面字串檢查，回傳 (是否通過, 訊息) 列表"""
+    content = read_text_cached(file_path)
+    found = _find_literals(content, tuple(checks))
 
     results = []
     for pattern, desc in checks.items():
-        if pattern in content:
+        if pattern in found:
             results.append((True, f"✅ {desc}"))
         else:
             results.append((False, f"❌ {desc}"))
@@ -46,49 +68,30 @@ def check_claude_md():
     return results
 
 
-def check_implementation_md():
-    """檢查 docs/Implementation.md"""
-    file_path = project_root / 'docs' / 'Implementation.md'
-
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+def check_claude_md():
+    """檢查 CLAUDE.md"""
+    return _run_checks(project_root / 'CLAUDE.md', {
+        'PE Relative: **30%**': 'PE 估值權重 30%',
+        'ROE: 15%, EPS YoY: 15%': 'ROE 和 EPS YoY 各 15%',
+        'FCF: 10%': 'FCF 10%',
+    })
 
-    checks = {
-        r"PE相對估值評分 × 0\.30": "偽代碼中 PE 權重 0.30",
-        r"ROE評分 × 0\.15": "偽代碼中 ROE 權重 0.15",
-        r"\| \*\*PE 相對估值\*\* \| \*\*30%\*\*": "權重配置表格中 PE 30%",
-    }
 
-    results = []
-    for pattern, desc in checks.items():
-        if re.search(pattern, content):
-            results.append((True, f"✅ {desc}"))
-        else:
-            results.append((False, f"❌ {desc}"))
-
-    return results
+def check_implementation_md():
+    """檢查 docs/Implementation.md"""
+    return _run_checks(project_root / 'docs' / 'Implementation.md', {
+        "PE相對估值評分 × 0.30": "偽代碼中 PE 權重 0.30",
+        "ROE評分 × 0.15": "偽代碼中 ROE 權重 0.15",
+        "| **PE 相對估值** | **30%**": "權重配置表格中 PE 30%",
+    })
 
 
 def check_readme_md():
     """檢查 README.md"""
-    file_path = project_root / 'README.md'
-
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    checks = {
+    return _run_checks(project_root / 'README.md', {
         'PE 估值 30%': 'PE 估值 30%',
         'ROE 15%': 'ROE 15%',
-    }
-
-    results = []
-    for pattern, desc in checks.items():
-        if pattern in content:
-            results.append((True, f"✅ {desc}"))
-        else:
-            results.append((False, f"❌ {desc}"))
-
-    return results
+    })
 
 
 def main():
@@ -11,8 +11,8 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-import yaml
 from src.factors import FactorEngine
+from src.utils.yaml_cache import load_yaml_cached
 
 
 def verify_weights():
@@ -25,9 +25,8 @@ def verify_weights():
     config_path = project_root / 'config' / 'parameters.yaml'
 
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
-            weights = config.get('screening', {}).get('factor_weights', {})
+        config = load_yaml_cached(config_path)
+        weights = config.get('screening', {}).get('factor_weights', {})
     except Exception as e:
         print(f"❌ 读取配置文件失败: {e}")
         return False
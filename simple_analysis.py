@@ -3,6 +3,7 @@
 """簡單分析選股流程"""
 
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
 # 讀取選股結果
@@ -24,16 +25,13 @@ print(f'=' * 60)
 print(f'股票池檢查')
 print(f'=' * 60)
 
-stocks = []
-with open('config/top_stocks.txt', 'r', encoding='utf-8') as f:
-    for line in f:
-        line = line.strip()
-        if not line or line.startswith('#'):
-            continue
-        # 取第一個空格之前的部分作為股票代碼
-        symbol = line.split()[0]
-        if symbol.isdigit():
-            stocks.append(symbol)
+# 一次讀入後單次推導式處理；略過空行與註解，取第一個空格之前的部分作為股票代碼
+lines = Path('config/top_stocks.txt').read_text(encoding='utf-8').splitlines()
+stocks = [
+    symbol
+    for symbol in (line.split(maxsplit=1)[0] for line in lines if line.strip() and not line.lstrip().startswith('#'))
+    if symbol.isdigit()
+]
 
 print(f'有效股票數: {len(stocks)}')
 print(f'前 10 個: {stocks[:10]}')
@@ -53,10 +51,18 @@ test_symbols = ['2356', '2027', '1229', '8046', '4746', '5269', '6782', '3293',
                 '1513', '6285', '3036', '3702', '2206', '3529', '2376', '8938', '2812', '2395',
                 '9910', '6505', '2886', '2404', '1102', '9933', '3005', '2912', '5434']
 
+CHIP_COLUMNS = ['trust_net', 'foreign_net', 'dealer_net', 'total_net']
+
+# 籌碼與大戶持股各以一次 Dataset 掃描讀入所有股票，再依 symbol 取最近幾筆
+chip_all = data_manager.read_chip_data_batch(test_symbols, columns=['symbol', 'date'] + CHIP_COLUMNS)
+recent_chips = dict(tuple(chip_all.groupby('symbol', sort=False).tail(5).groupby('symbol', sort=False)))
+share_all = data_manager.read_shareholding_data_batch(test_symbols, columns=['symbol', 'date', 'major_ratio'])
+recent_shares = dict(tuple(share_all.groupby('symbol', sort=False).tail(2).groupby('symbol', sort=False)))
+
 chip_results = []
 for symbol in test_symbols:
-    chip_df = data_manager.read_chip_data(symbol)
-    if chip_df.empty or len(chip_df) < 5:
+    chip_df = recent_chips.get(symbol)
+    if chip_df is None or len(chip_df) < 5:
         chip_results.append({
             'symbol': symbol,
             'chip_score': 0,
@@ -64,56 +70,34 @@ for symbol in test_symbols:
         })
         continue
 
-    recent_5d = chip_df.tail(5)
-    chip_score = 0
-
-    # 投信連買
-    trust_consecutive = 0
-    for i in range(len(recent_5d) - 1, -1, -1):
-        if recent_5d.iloc[i]['trust_net'] > 0:
-            trust_consecutive += 1
-        else:
-            break
-
-    if trust_consecutive >= 5:
-        chip_score += 30
-    elif trust_consecutive >= 3:
-        chip_score += 20
-    elif trust_consecutive >= 1:
-        chip_score += 10
-
-    # 外資
-    foreign_5d_avg = recent_5d['foreign_net'].mean()
-    foreign_latest = recent_5d.iloc[-1]['foreign_net']
-
-    if foreign_5d_avg > 1000 and foreign_latest > 0:
-        chip_score += 25
-    elif foreign_5d_avg > 0:
-        chip_score += 15
-    elif foreign_5d_avg > -1000:
-        chip_score += 5
-
-    # 自營
-    dealer_5d_total = recent_5d['dealer_net'].sum()
-    if dealer_5d_total > 0:
-        chip_score += 15
-    elif dealer_5d_total > -500:
-        chip_score += 8
-
-    # 法人合計
-    total_5d_sum = recent_5d['total_net'].sum()
-    if total_5d_sum > 5000:
-        chip_score += 20
-    elif total_5d_sum > 1000:
-        chip_score += 15
-    elif total_5d_sum > 0:
-        chip_score += 10
+    # 近 5 日籌碼一次轉為 NumPy 陣列，逐欄取用
+    trust, foreign, dealer, total = chip_df[CHIP_COLUMNS].to_numpy(dtype=np.float64).T
+
+    # 投信連買：由最新一天往回數連續買超天數
+    buying = trust[::-1] > 0
+    trust_consecutive = len(buying) if buying.all() else int(np.argmax(~buying))
+
+    # 外資 / 自營 / 法人合計 (nan 系列函數與 pandas 相同略過缺值)
+    foreign_5d_avg = np.nanmean(foreign)
+    foreign_latest = foreign[-1]
+    dealer_5d_total = np.nansum(dealer)
+    total_5d_sum = np.nansum(total)
+
+    # 各項分級門檻：np.select 依序取第一個成立條件的分數
+    chip_score = int(
+        np.select([trust_consecutive >= 5, trust_consecutive >= 3, trust_consecutive >= 1],
+                  [30, 20, 10], 0)
+        + np.select([(foreign_5d_avg > 1000) & (foreign_latest > 0), foreign_5d_avg > 0, foreign_5d_avg > -1000],
+                    [25, 15, 5], 0)
+        + np.select([dealer_5d_total > 0, dealer_5d_total > -500], [15, 8], 0)
+        + np.select([total_5d_sum > 5000, total_5d_sum > 1000, total_5d_sum > 0], [20, 15, 10], 0)
+    )
 
     # 大戶持股
-    share_df = data_manager.read_shareholding_data(symbol)
-    if not share_df.empty and len(share_df) >= 2:
-        latest_ratio = share_df.iloc[-1]['major_ratio']
-        prev_ratio = share_df.iloc[-2]['major_ratio']
+    share_df = recent_shares.get(symbol)
+    if share_df is not None and len(share_df) >= 2:
+        latest_ratio = share_df['major_ratio'].iat[-1]
+        prev_ratio = share_df['major_ratio'].iat[-2]
         ratio_change = latest_ratio - prev_ratio
         if ratio_change > 0.5:
             chip_score += 10
@@ -127,25 +111,32 @@ for symbol in test_symbols:
         'status': status
     })
 
-result_df = pd.DataFrame(chip_results).sort_values('chip_score', ascending=False)
+# 分數轉為 ndarray 後排序與門檻遮罩各只計算一次
+scores = np.fromiter((r['chip_score'] for r in chip_results), dtype=np.int64, count=len(chip_results))
+order = np.argsort(-scores, kind='stable')
+sorted_scores = scores[order]
+pass_mask = sorted_scores >= 60
+close_mask = (sorted_scores >= 50) & ~pass_mask
+
+result_df = pd.DataFrame(chip_results).iloc[order]
 print(result_df.to_string(index=False))
 print()
 
 print(f'=' * 60)
 print(f'結論')
 print(f'=' * 60)
-passed = result_df[result_df['chip_score'] >= 60]
+passed = result_df[pass_mask]
 print(f'通過籌碼面（>= 60分）: {len(passed)} 檔')
 if len(passed) > 0:
     print(passed[['symbol', 'chip_score']].to_string(index=False))
 
-failed_but_close = result_df[(result_df['chip_score'] >= 50) & (result_df['chip_score'] < 60)]
+failed_but_close = result_df[close_mask]
 print(f'\n接近門檻（50-59分）: {len(failed_but_close)} 檔')
 if len(failed_but_close) > 0:
     print(failed_but_close[['symbol', 'chip_score']].to_string(index=False))
 
-print(f'\n籌碼面平均分數: {result_df["chip_score"].mean():.1f}')
-print(f'籌碼面中位數: {result_df["chip_score"].median():.1f}')
+print(f'\n籌碼面平均分數: {scores.mean():.1f}')
+print(f'籌碼面中位數: {np.median(scores):.1f}')
 print(f'\n💡 建議: 如果想要更多選股結果，可以考慮：')
 print(f'  1. 降低籌碼面門檻（目前 60 分，可調整至 50-55 分）')
 print(f'  2. 調整各因子權重（目前投信 30%, 外資 25%, 自營 15%, 合計 20%, 持股 10%）')
@@ -13,19 +13,43 @@ FinGear - 台股量化分析系統核心模組
 __version__ = "0.1.0"
 __author__ = "FinGear Team"
 
-# Optional imports - only load if dependencies are available
-try:
-    from .api_client import ShioajiClient
-    _SHIOAJI_AVAILABLE = True
-except ImportError:
-    ShioajiClient = None
-    _SHIOAJI_AVAILABLE = False
-
-from .parquet_manager import ParquetManager
-from .factors import FactorEngine
-from .screener import StockScreener
-from .data_validator import DataValidator
-from .notification import NotificationService
+import importlib
+
+# 延遲載入：僅在實際存取時才匯入子模組，避免 `import src.xxx` 連帶載入
+# shioaji、requests 等較重的依賴
+_LAZY_EXPORTS = {
+    "ShioajiClient": ".api_client",
+    "ParquetManager": ".parquet_manager",
+    "FactorEngine": ".factors",
+    "StockScreener": ".screener",
+    "DataValidator": ".data_validator",
+    "NotificationService": ".notification",
+}
+
+
+def __getattr__(name: str):
+    """PEP 562 模組層級延遲屬性存取"""
+    global _SHIOAJI_AVAILABLE
+    if name == "_SHIOAJI_AVAILABLE":
+        __getattr__("ShioajiClient")
+        return _SHIOAJI_AVAILABLE
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # Optional imports - only load if dependencies are available
+    try:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        if name == "ShioajiClient":
+            _SHIOAJI_AVAILABLE = True
+    except ImportError:
+        if name != "ShioajiClient":
+            raise
+        value = None
+        _SHIOAJI_AVAILABLE = False
+
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "ShioajiClient",
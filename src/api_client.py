@@ -13,7 +13,9 @@ Shioaji API 客戶端模組
 import threading
 import time
 import logging
+from collections import deque
 from typing import Optional, List
+import numpy as np
 import pandas as pd
 import shioaji as sj
 from datetime import datetime
@@ -26,15 +28,18 @@ class RateLimiter:
     def __init__(self, max_requests: int = 60, time_window: int = 60):
         self.max_requests = max_requests
         self.time_window = time_window
-        self.request_timestamps = []
+        # 時間戳依序遞增，過期項目一律位於左端，可 O(1) popleft
+        self.request_timestamps = deque(maxlen=max_requests)
         self.lock = threading.Lock()
 
     def wait_if_needed(self):
         """若超過速率限制則等待"""
         with self.lock:
-            now = time.time()
+            # 使用單調時鐘，不受系統校時 (NTP) 影響
+            now = time.monotonic()
             # 清理超時的時間戳
-            self.request_timestamps = [ts for ts in self.request_timestamps if now - ts < self.time_window]
+            while self.request_timestamps and now - self.request_timestamps[0] >= self.time_window:
+                self.request_timestamps.popleft()
             
             if len(self.request_timestamps) >= self.max_requests:
                 sleep_time = self.time_window - (now - self.request_timestamps[0])
@@ -42,7 +47,7 @@ class RateLimiter:
                     logging.warning(f"超過速率限制，等待 {sleep_time:.2f} 秒...")
                     time.sleep(sleep_time)
             
-            self.request_timestamps.append(time.time())
+            self.request_timestamps.append(time.monotonic())
 
 class APIErrorHandler:
     """API 錯誤處理器"""
@@ -72,6 +77,9 @@ class ShioajiClient:
     _instance = None
     _lock = threading.Lock()
 
+    # snapshots 單次請求的合約數上限
+    SNAPSHOT_BATCH_SIZE = 500
+
     def __new__(cls, *args, **kwargs):
         with cls._lock:
             if cls._instance is None:
@@ -79,7 +87,13 @@ class ShioajiClient:
             return cls._instance
 
     def __init__(self, api_key: str = "", secret_key: str = "", simulation: bool = False):
-        if not hasattr(self, 'initialized'):
+        # 已初始化時直接返回，不需取鎖
+        if getattr(self, 'initialized', False):
+            return
+        # 雙重檢查鎖定：多執行緒同時首次建立時，確保 sj.Shioaji 只建構一次
+        with self._lock:
+            if getattr(self, 'initialized', False):
+                return
             self.api_key = api_key
             self.secret_key = secret_key
             self.simulation = simulation
@@ -87,8 +101,8 @@ class ShioajiClient:
             self.is_connected = False
             self.lock = threading.Lock()
             self.rate_limiter = RateLimiter(max_requests=50, time_window=60) # 略低於官方限制以保安全
-            self.initialized = True
             self.logger = logging.getLogger(__name__)
+            self.initialized = True
 
     def connect(self) -> bool:
         with self.lock:
@@ -121,22 +135,78 @@ class ShioajiClient:
             contract = self.api.Contracts.Stocks[symbol]
             kbars = self.api.kbars(contract=contract, start=start_date, end=end_date)
             
-            df = pd.DataFrame({
-                'date': kbars.ts,
-                'open': kbars.Open,
-                'high': kbars.High,
-                'low': kbars.Low,
-                'close': kbars.Close,
-                'volume': kbars.Volume,
-                'amount': kbars.Amount
+            # 各欄位直接由 kbars 陣列建立；ts 為 epoch 奈秒，建構時即轉為 datetime64，不需事後整欄轉換
+            return pd.DataFrame({
+                'date': pd.to_datetime(np.asarray(kbars.ts, dtype=np.int64), unit='ns'),
+                'open': np.asarray(kbars.Open, dtype=np.float64),
+                'high': np.asarray(kbars.High, dtype=np.float64),
+                'low': np.asarray(kbars.Low, dtype=np.float64),
+                'close': np.asarray(kbars.Close, dtype=np.float64),
+                'volume': np.asarray(kbars.Volume, dtype=np.int64),
+                'amount': np.asarray(kbars.Amount, dtype=np.float64),
+                'symbol': symbol
             })
-            df['date'] = pd.to_datetime(df['date'])
-            df['symbol'] = symbol
-            return df
         except Exception as e:
             self.logger.error(f"抓取 {symbol} 歷史數據失敗: {e}", exc_info=True)
             raise
 
+    @APIErrorHandler.retry_on_failure(max_retries=3)
+    def get_daily_snapshots(self, symbols: List[str], trade_date: Optional[str] = None) -> pd.DataFrame:
+        """
+        以 snapshots 批次請求取得多檔股票當日 OHLCV
+
+        每次請求最多 SNAPSHOT_BATCH_SIZE 檔，取代逐檔 kbars 的往返成本。
+        僅適用於當日行情；歷史日期請使用 get_historical_data。
+
+        Args:
+            symbols: 股票代碼列表 (查無合約者記錄警告後略過)
+            trade_date: 交易日 'YYYY-MM-DD'；指定時只保留快照時間為該日的資料。
+                非交易日 snapshots 仍回傳上一交易日行情，過濾後為空表。
+        """
+        if not self.is_connected:
+            self.connect()
+
+        contracts = []
+        for symbol in symbols:
+            try:
+                contract = self.api.Contracts.Stocks[symbol]
+            except (KeyError, IndexError):
+                contract = None
+            if contract is None:
+                self.logger.warning("查無股票合約，略過: %s", symbol)
+            else:
+                contracts.append(contract)
+
+        frames = []
+        try:
+            for i in range(0, len(contracts), self.SNAPSHOT_BATCH_SIZE):
+                self.rate_limiter.wait_if_needed()
+                snapshots = self.api.snapshots(contracts[i:i + self.SNAPSHOT_BATCH_SIZE])
+                frames.append(pd.DataFrame({
+                    # 快照時間為盤中時刻 (如 13:30)，日線以日期為鍵，截至當日 00:00
+                    'date': pd.to_datetime([s.ts for s in snapshots]).normalize(),
+                    'open': [s.open for s in snapshots],
+                    'high': [s.high for s in snapshots],
+                    'low': [s.low for s in snapshots],
+                    'close': [s.close for s in snapshots],
+                    'volume': [s.total_volume for s in snapshots],
+                    'amount': [s.total_amount for s in snapshots],
+                    'symbol': [s.code for s in snapshots]
+                }))
+        except Exception as e:
+            self.logger.error(f"批次抓取當日快照失敗: {e}", exc_info=True)
+            raise
+
+        if not frames:
+            return pd.DataFrame()
+        df = pd.concat(frames, ignore_index=True)
+        if trade_date is not None:
+            stale = df['date'] != pd.Timestamp(trade_date)
+            if stale.any():
+                self.logger.info("略過 %d 筆非 %s 的快照 (上一交易日行情)", int(stale.sum()), trade_date)
+                df = df[~stale].reset_index(drop=True)
+        return df
+
     @APIErrorHandler.retry_on_failure(max_retries=3)
     def get_institutional_trades(self, date_str: str) -> pd.DataFrame:
         # 注意：Shioaji 抓取法人數據可能需要特定權限或調用方式
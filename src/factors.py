@@ -9,13 +9,85 @@
 參考：docs/Implementation.md 第 3.2 節
 """
 
+import hashlib
 import logging
-import yaml
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import date
-from typing import Dict
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Set, Tuple
 from pathlib import Path
+import numpy as np
 import pandas as pd
 from src.utils.exceptions import ValidationError
+from src.factors_jit import RAW_FACTORS, compute_raw_factors
+from src.utils.yaml_cache import load_yaml_cached
+
+# 基本面因子計算所需的財報欄位
+FUNDAMENTAL_COLUMNS = (
+    'net_income', 'equity', 'eps', 'revenue', 'gross_profit',
+    'operating_cash_flow', 'capital_expenditure', 'total_liabilities', 'total_assets',
+)
+
+# 讀取財報時只需的欄位 (所有因子所需欄位的聯集)
+FUNDAMENTAL_READ_COLUMNS = ('date', *FUNDAMENTAL_COLUMNS)
+
+# 因子計算只需最近 5 季 (本季 + 去年同季)
+QUARTER_WINDOW = 5
+
+# 分數儲存的指紋版本；因子計算邏輯變更時遞增，使舊儲存失效
+SCORE_STORE_VERSION = '1'
+
+
+# 完整評分規則：涵蓋所有 7 個因子 [(門檻, 分數), ...]
+SCORING_RULES = {
+    # ROE (%) - 越高越好
+    'roe': [(20, 5), (15, 4), (10, 3), (5, 2), (-float('inf'), 1)],
+
+    # EPS YoY (%) - 越高越好
+    'eps_yoy': [(30, 5), (15, 4), (0, 3), (-10, 2), (-float('inf'), 1)],
+
+    # FCF (億) - 越高越好，以億為單位
+    'fcf': [(5_000_000_000, 5), (1_000_000_000, 4), (0, 3), (-1_000_000_000, 2), (-float('inf'), 1)],
+
+    # Gross Margin Trend (%) - 毛利率變化，越高越好
+    'gross_margin_trend': [(2.0, 5), (0.5, 4), (-0.5, 3), (-2.0, 2), (-float('inf'), 1)],
+
+    # Revenue YoY (%) - 越高越好
+    'revenue_yoy': [(20, 5), (10, 4), (0, 3), (-5, 2), (-float('inf'), 1)],
+
+    # Debt Ratio (%) - 越低越好（反向評分）
+    'debt_ratio': [(30, 5), (50, 4), (70, 3), (85, 2), (float('inf'), 1)],
+
+    # PE Relative (標準差偏離) - 越低越好，負值表示被低估
+    'pe_relative': [(-1.0, 5), (0.0, 4), (1.0, 3), (2.0, 2), (float('inf'), 1)]
+}
+
+# 反向評分因子（越低越好：raw_value <= threshold 才能得分）
+_REVERSE = frozenset({'debt_ratio', 'pe_relative'})
+
+
+def _build_score_table() -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    將評分規則轉為遞增排序的門檻 (float64) 與分數 (int8) 陣列，供 np.searchsorted 查表
+
+    反向評分因子的門檻取負號，使「越低越好」同樣化為「>= 門檻即得分」。
+    """
+    tables = {}
+    for factor_name, rules in SCORING_RULES.items():
+        sign = -1.0 if factor_name in _REVERSE else 1.0
+        pairs = sorted((sign * threshold, score) for threshold, score in rules)
+        tables[factor_name] = (
+            np.array([threshold for threshold, _ in pairs], dtype=np.float64),
+            np.array([score for _, score in pairs], dtype=np.int8),
+        )
+    return tables
+
+
+# 模組載入時建表一次，所有 FactorEngine 實例共用
+_SCORE_TABLE = _build_score_table()
 
 
 class FactorEngine:
@@ -32,23 +104,38 @@ class FactorEngine:
     Examples:
         >>> engine = FactorEngine(data_manager)
         >>> score = engine.calculate_fundamental_score('2330')
+        >>> scores = engine.calculate_fundamental_scores(['2330', '2317'])
     """
 
-    def __init__(self, data_manager):
+    # 評分規則與反向評分因子 (模組層級常數，保留類別屬性供外部參考)
+    SCORING_RULES = SCORING_RULES
+    REVERSE_FACTORS = _REVERSE
+
+    def __init__(self, data_manager, score_store_path: Optional[Path] = None):
         """
         初始化因子引擎
 
         Args:
             data_manager: 數據管理器
+            score_store_path: 因子分數儲存檔 (parquet)；指定後跨行程沿用
+                輸入數據 (財報與股價) 未變動股票的計算結果，需呼叫 flush_cache() 寫回
         """
         self.data_manager = data_manager
         self.cache = {}
+        # 跨行程的因子原始值儲存 (延遲載入)
+        self.score_store_path = Path(score_store_path) if score_store_path is not None else None
+        self._score_store: Optional[Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]]] = None
+        self._score_store_dirty = False
+        # 篩選期間的個股財報快取 (僅於 screening_scope 區塊內啟用)
+        self._fund_cache: Optional[Dict[str, pd.DataFrame]] = None
+        # 保護 cache 與分數儲存的寫入 (calculate_fundamental_scores_parallel 多執行緒共用)
+        self._lock = threading.Lock()
         self.logger = logging.getLogger(__name__)
         
         # 載入配置權重
         self.weights = self._load_weights()
 
-        # 註冊因子計算策略
+        # 註冊因子計算策略：內建因子由批次核心整批計算，其餘註冊的因子逐檔呼叫其計算函數
         self.fundamental_factors = {
             'roe': self._calculate_roe,
             'gross_margin_trend': self._calculate_gross_margin_trend,
@@ -59,8 +146,18 @@ class FactorEngine:
             'pe_relative': self._calculate_pe_relative
         }
 
-    def _load_weights(self) -> Dict[str, float]:
-        """從 parameters.yaml 載入權重設定"""
+    @property
+    def _factor_names(self) -> List[str]:
+        """評分計畫的因子順序 (同 fundamental_factors 註冊順序，初始化後新增的因子亦納入)"""
+        return list(self.fundamental_factors)
+
+    @property
+    def _weight_vec(self) -> np.ndarray:
+        """與 _factor_names 對應的權重向量，批次評分以矩陣乘法加權"""
+        return np.array([self.weights.get(name, 0) for name in self._factor_names], dtype=np.float64)
+
+    def _load_weights(self) -> Mapping[str, float]:
+        """從 parameters.yaml 載入權重設定 (唯讀映射，各引擎實例共用)"""
         default_weights = {
             'roe': 0.15,              # ROE 股東權益報酬率 15%
             'eps_yoy': 0.15,          # EPS 年增率 15%
@@ -74,55 +171,454 @@ class FactorEngine:
         config_path = Path(__file__).parent.parent / 'config' / 'parameters.yaml'
         if not config_path.exists():
             self.logger.warning(f"找不到設定檔 {config_path}，使用預設權重")
-            return default_weights
+            return MappingProxyType(default_weights)
             
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
-                weights = config.get('screening', {}).get('factor_weights', {})
-                if not weights:
-                    return default_weights
-                return weights
+            # load_yaml_cached 依 mtime 快取解析結果，重複建立引擎時不重新讀檔；
+            # 另建唯讀映射，避免就地修改共用的快取物件
+            config = load_yaml_cached(config_path)
+            weights = config.get('screening', {}).get('factor_weights', {})
+            return MappingProxyType(dict(weights) if weights else default_weights)
         except Exception as e:
             self.logger.error(f"讀取權重設定失敗: {e}，使用預設值", exc_info=True)
-            return default_weights
+            return MappingProxyType(default_weights)
 
     def calculate_fundamental_score(self, symbol: str) -> float:
         """
         計算基本面綜合得分 (0-200 分)
+
+        單檔版本：讀取該檔財報後交由與批次版本相同的向量化評分流程
         """
         # 1. 檢查緩存
         cache_key = f"{symbol}_fundamental_{date.today()}"
         if cache_key in self.cache:
             return self.cache[cache_key]
 
-        # 2. 計算各因子分數和原始值
-        scores = {}
-        raw_values = {}
-        for factor_name, calc_func in self.fundamental_factors.items():
+        # 2. 單檔財報視為只有一個 symbol 的長表
+        df, present = self._single_symbol_input(symbol)
+        return self._score_batch([symbol], df, present)[symbol]
+
+    def _single_symbol_input(self, symbol: str,
+                             df: Optional[pd.DataFrame] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """讀取 (或沿用已讀取的) 單檔財報，轉為批次流程所需的 (長表, 欄位具備標記)"""
+        if df is None:
+            df = self._get_fundamental_data(symbol)
+        present = pd.DataFrame(
+            [[col in df.columns for col in FUNDAMENTAL_COLUMNS]],
+            index=[symbol], columns=list(FUNDAMENTAL_COLUMNS)
+        )
+        return df.assign(symbol=symbol), present
+
+    def _statement_factor(self, symbol: str, factor_name: str, df: Optional[pd.DataFrame] = None) -> float:
+        """以批次數值核心計算單檔的單一財報因子原始值"""
+        df, present = self._single_symbol_input(symbol, df)
+        raw, _ = self._compute_raw_factors([symbol], df, present)
+        return float(raw.at[symbol, factor_name])
+
+    def calculate_fundamental_scores(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        批次計算多檔股票的基本面綜合得分 (0-200 分)
+
+        一次讀入所有股票的財報長表，各因子以 groupby 向量化計算，
+        結果寫入與單檔版本相同的緩存鍵。
+
+        註：批次讀取會合併各檔 schema，某檔整欄皆為缺值時視同缺少該欄位。
+
+        Args:
+            symbols: 股票代碼列表
+
+        Returns:
+            dict: {symbol: 綜合得分}
+        """
+        today = date.today()
+        symbols = list(dict.fromkeys(symbols))
+        pending = [s for s in symbols if f"{s}_fundamental_{today}" not in self.cache]
+
+        if pending:
+            df = self.data_manager.read_fundamental_data_bulk(pending, columns=['symbol', *FUNDAMENTAL_READ_COLUMNS])
+            df = df.reindex(columns=['symbol', 'date', *FUNDAMENTAL_COLUMNS])
+            if not pd.api.types.is_datetime64_any_dtype(df['date']):
+                df['date'] = pd.to_datetime(df['date'])
+            df = df.sort_values(['symbol', 'date'], kind='stable')
+            present = df[list(FUNDAMENTAL_COLUMNS)].notna().groupby(df['symbol'], sort=False).any()
+            self._score_batch(pending, df, present)
+
+        return {s: self.cache[f"{s}_fundamental_{today}"] for s in symbols}
+
+    def calculate_fundamental_scores_parallel(self, symbols: List[str],
+                                              max_workers: Optional[int] = None) -> Dict[str, float]:
+        """
+        以執行緒池並行計算多檔股票的基本面綜合得分 (0-200 分)
+
+        各檔計算彼此獨立，且 pyarrow 讀檔與 NumPy 運算期間會釋放 GIL，
+        以執行緒重疊各檔的 I/O 與計算。假設 data_manager 在計算期間只讀不寫。
+
+        Args:
+            symbols: 股票代碼列表
+            max_workers: 執行緒數，預設為 CPU 核心數
+
+        Returns:
+            dict: {symbol: 綜合得分}
+        """
+        symbols = list(dict.fromkeys(symbols))
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            return dict(zip(symbols, executor.map(self.calculate_fundamental_score, symbols)))
+
+    def _score_batch(self, symbols: List[str], df: pd.DataFrame, present: pd.DataFrame) -> Dict[str, float]:
+        """
+        對多檔股票評分並寫入緩存
+
+        Args:
+            symbols: 股票代碼列表
+            df: 財報長表 (含 symbol 欄位，已依 symbol、date 排序)
+            present: 各檔是否具備各財報欄位 (index=symbol, columns=FUNDAMENTAL_COLUMNS)
+
+        Returns:
+            dict: {symbol: 綜合得分}
+        """
+        # 1. 計算各因子原始值 (failed 標記計算失敗者，給予最低分)
+        factor_names = self._factor_names
+        raw, failed = self._raw_factors(symbols, df, present)
+
+        # 2. 評分 (1-5 分)
+        scores = pd.DataFrame(
+            {name: self._score_factor_vec(name, raw[name].to_numpy()) for name in factor_names},
+            index=raw.index
+        ).mask(failed, 1)
+
+        # 3. 加權聚合：1.0 (全最低) -> 40分, 5.0 (全最高) -> 200分
+        totals = scores.to_numpy(dtype=np.float64) @ self._weight_vec * 40
+
+        # 4. 寫入緩存（同時緩存詳細分數和原始值）
+        today = date.today()
+        results = {}
+        for symbol, total, score_row, raw_row, failed_row in zip(
+                raw.index, totals, scores.itertuples(index=False), raw.itertuples(index=False),
+                failed.itertuples(index=False)):
+            cache_key = f"{symbol}_fundamental_{today}"
+            details = dict(zip(factor_names, map(int, score_row)))
+            raw_values = {
+                name: None if is_failed else float(value)
+                for name, value, is_failed in zip(factor_names, raw_row, failed_row)
+            }
+            results[symbol] = float(total)
+            # 詳細分數與原始值先寫入，使其他執行緒看到總分時細項必已就緒
+            with self._lock:
+                self.cache[f"{cache_key}_details"] = details
+                self.cache[f"{cache_key}_raw_values"] = raw_values
+                self.cache[cache_key] = results[symbol]
+
+        return results
+
+    def _fundamental_windows(self, symbols: List[str], df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        將財報長表轉為各欄位的 (股票數, 5) 視窗陣列
+
+        每列為一檔股票：第 0 欄為最新一季、第 4 欄為去年同季，不足 5 季以 NaN 補齊。
+        各因子只需最近 5 季，之後的計算皆為整批陣列運算，不再經過 pandas 索引。
+
+        Returns:
+            (各檔總季數, 視窗陣列 (欄位數, 股票數, 5)，欄位順序同 FUNDAMENTAL_COLUMNS)
+        """
+        cols = list(FUNDAMENTAL_COLUMNS)
+        codes = pd.Index(symbols).get_indexer(df['symbol'])
+        rows = np.flatnonzero(codes >= 0)
+        codes = codes[rows]
+        n_rows = np.bincount(codes, minlength=len(symbols))
+
+        # 長表已依 symbol、date 排序；穩定排序後同檔各列連續，由各檔末端往回推算位置
+        order = np.argsort(codes, kind='stable')
+        codes, rows = codes[order], rows[order]
+        slot = np.cumsum(n_rows)[codes] - 1 - np.arange(len(codes))
+        recent = slot < QUARTER_WINDOW
+
+        # 欄位為第一維，使各欄位視窗在記憶體中連續 (供 JIT 核心直接使用)
+        windows = np.full((len(cols), len(symbols), QUARTER_WINDOW), np.nan)
+        values = df.reindex(columns=cols).to_numpy(dtype=np.float64)
+        windows[:, codes[recent], slot[recent]] = values[rows[recent]].T
+        return n_rows, windows
+
+    def _compute_raw_factors(self, symbols: List[str], df: pd.DataFrame,
+                             present: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        整批計算多檔股票的財報因子原始值 (PE 相對值除外)
+
+        數值計算由 src.factors_jit 核心完成 (安裝 numba 時為 JIT 編譯版本)。
+
+        Returns:
+            (raw, failed): index 為 symbols 的原始值與計算失敗標記
+        """
+        index = pd.Index(symbols, name='symbol')
+        has = np.ascontiguousarray(
+            present.reindex(index=index, columns=list(FUNDAMENTAL_COLUMNS), fill_value=False).to_numpy(dtype=bool)
+        )
+        n_rows, windows = self._fundamental_windows(symbols, df)
+        values, roe_failed = compute_raw_factors(n_rows, has, *windows)
+
+        raw = pd.DataFrame(values, index=index, columns=list(RAW_FACTORS))
+        failed = pd.DataFrame(False, index=index, columns=self._factor_names)
+        failed['roe'] = roe_failed
+
+        for symbol in index[roe_failed]:
+            self.logger.warning(f"計算因子 roe 失敗 ({symbol}): Missing columns for ROE")
+
+        return raw, failed
+
+    def _raw_factors(self, symbols: List[str], df: pd.DataFrame,
+                     present: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        計算各因子原始值 (欄位順序同 fundamental_factors)
+
+        啟用分數儲存時，輸入數據 (財報與股價) 指紋未變動的股票直接取用儲存結果，
+        只計算其餘股票。
+        """
+        factor_names = self._factor_names
+        groups = dict(tuple(df.groupby('symbol', sort=False)))
+
+        # PE 相對值只對至少 5 季且具 EPS 的股票計算，也只需讀取這些股票的股價
+        pe_symbols = [
+            s for s in symbols
+            if s in groups and len(groups[s]) >= 5 and present.at[s, 'eps']
+        ]
+        prices, unreadable = self._read_pe_prices(pe_symbols)
+
+        if self.score_store_path is None:
+            return self._compute_all_raw(symbols, df, present, pe_symbols, prices, unreadable)
+
+        store = self._load_score_store()
+        price_groups = dict(tuple(prices.groupby('symbol', sort=False)))
+        fingerprints = {
+            s: self._fingerprint(s, groups.get(s), present, price_groups.get(s) if s in pe_symbols else None)
+            for s in symbols
+        }
+        pending = [s for s in symbols if (s, fingerprints[s]) not in store]
+        computed = {}
+        if pending:
+            raw, failed = self._compute_all_raw(
+                pending, df[df['symbol'].isin(pending)], present,
+                [s for s in pe_symbols if s in set(pending)], prices, unreadable
+            )
+            computed = dict(zip(pending, zip(raw.to_numpy(), failed.to_numpy())))
+            for symbol, values in computed.items():
+                # 股價讀取失敗屬暫時性錯誤，不寫入儲存
+                if symbol in unreadable:
+                    continue
+                store[(symbol, fingerprints[symbol])] = values
+                self._score_store_dirty = True
+
+        rows = [computed.get(s) or store[(s, fingerprints[s])] for s in symbols]
+        index = pd.Index(symbols, name='symbol')
+        raw = pd.DataFrame([r for r, _ in rows], index=index, columns=factor_names, dtype=np.float64)
+        failed = pd.DataFrame([f for _, f in rows], index=index, columns=factor_names, dtype=bool)
+        return raw, failed
+
+    def _compute_all_raw(self, symbols: List[str], df: pd.DataFrame, present: pd.DataFrame,
+                         pe_symbols: List[str], prices: pd.DataFrame,
+                         unreadable: Set[str]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """計算財報因子與 PE 相對值原始值，批次核心未涵蓋的註冊因子逐檔計算"""
+        raw, failed = self._compute_raw_factors(symbols, df, present)
+        raw['pe_relative'], failed['pe_relative'] = self._pe_relative_batch(
+            symbols, df, pe_symbols, prices, unreadable
+        )
+        factor_names = self._factor_names
+        for name in factor_names:
+            if name not in raw.columns:
+                raw[name], failed[name] = self._registered_factor_batch(name, symbols)
+        return raw[factor_names], failed[factor_names]
+
+    def _registered_factor_batch(self, factor_name: str, symbols: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """逐檔呼叫註冊的因子計算函數，回傳 (原始值, 計算失敗標記) 陣列 (例外時給予最低分)"""
+        calc_func = self.fundamental_factors[factor_name]
+        values = np.full(len(symbols), np.nan)
+        failed = np.zeros(len(symbols), dtype=bool)
+        for i, symbol in enumerate(symbols):
             try:
-                raw_value = calc_func(symbol)
-                scores[factor_name] = self._score_factor(factor_name, raw_value)
-                raw_values[factor_name] = raw_value  # 保存原始值
+                values[i] = calc_func(symbol)
             except Exception as e:
                 self.logger.warning(f"計算因子 {factor_name} 失敗 ({symbol}): {e}")
-                scores[factor_name] = 1  # 預設最低分
-                raw_values[factor_name] = None
+                failed[i] = True
+        return values, failed
 
-        # 3. 加權聚合
-        # 從設定檔讀取權重，若無則降級處理
-        weights = self.weights
+    def _read_pe_prices(self, symbols: List[str]) -> Tuple[pd.DataFrame, Set[str]]:
+        """
+        讀取多檔股價 (symbol, date, close)
 
-        weighted_score = sum(scores[f] * weights.get(f, 0) for f in scores if f in weights)
-        # 1.0 (全最低) -> 40分, 5.0 (全最高) -> 200分
-        final_score = weighted_score * 40
+        先以單次批次讀取；失敗時 (如各檔 schema 無法合併) 改為逐檔讀取，
+        回傳 (股價長表, 讀取失敗的股票)。
+        """
+        empty = pd.DataFrame(columns=['symbol', 'date', 'close'])
+        if not symbols:
+            return empty, set()
+        try:
+            return self.data_manager.read_prices_bulk(symbols), set()
+        except Exception as e:
+            self.logger.warning(f"批次讀取股價失敗，改為逐檔讀取: {e}")
 
-        # 4. 寫入緩存（同時緩存詳細分數和原始值）
-        self.cache[cache_key] = final_score
-        self.cache[f"{cache_key}_details"] = scores
-        self.cache[f"{cache_key}_raw_values"] = raw_values
+        frames, unreadable = [], set()
+        for symbol in symbols:
+            try:
+                price_df = self.data_manager.read_symbol_partition(symbol)
+                frames.append(price_df.reindex(columns=['date', 'close']).assign(symbol=symbol))
+            except Exception as e:
+                self.logger.warning(f"計算因子 pe_relative 失敗 ({symbol}): {e}")
+                unreadable.add(symbol)
+        return (pd.concat(frames, ignore_index=True) if frames else empty), unreadable
+
+    def _pe_relative_batch(self, symbols: List[str], df: pd.DataFrame, pe_symbols: List[str],
+                           prices: pd.DataFrame, unreadable: Set[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        計算多檔 PE 相對值，回傳 (原始值, 計算失敗標記) 陣列
+
+        不計算 PE 或無股價的股票為 1.0；批次計算失敗時改為逐檔計算以隔離錯誤。
+        """
+        values = pd.Series(1.0, index=pd.Index(symbols))
+        failed = pd.Series(False, index=values.index)
+        failed[list(unreadable)] = True
+        targets = [s for s in pe_symbols if s not in unreadable]
+
+        fund = df.loc[df['symbol'].isin(targets)].reindex(columns=['symbol', 'date', 'eps'])
+        try:
+            relative = self._pe_relative_bulk(fund, prices)
+            values[relative.index] = relative  # 不用 update：NaN 結果也需覆寫預設值
+        except Exception as e:
+            self.logger.warning(f"批次計算 PE 相對值失敗，改為逐檔計算: {e}")
+            fund_groups = dict(tuple(fund.groupby('symbol', sort=False)))
+            price_groups = dict(tuple(prices.groupby('symbol', sort=False)))
+            for symbol in targets:
+                price_df = price_groups.get(symbol)
+                if price_df is None or price_df.empty:
+                    continue
+                try:
+                    values[symbol] = self._pe_relative(price_df, fund_groups[symbol])
+                except Exception as e:
+                    self.logger.warning(f"計算因子 pe_relative 失敗 ({symbol}): {e}")
+                    failed[symbol] = True
+
+        values[failed] = np.nan
+        return values.to_numpy(dtype=np.float64), failed.to_numpy(dtype=bool)
+
+    def _pe_relative_bulk(self, fund: pd.DataFrame, prices: pd.DataFrame) -> pd.Series:
+        """
+        以單次 merge_asof (by='symbol') 計算多檔 PE 相對值
 
-        return final_score
+        規則同 _pe_relative：每日 PE = 收盤價 ÷ 當時最新 TTM EPS，
+        取近三年正值 PE 的平均與標準差，回傳當前 PE 的標準差偏離。
+
+        Args:
+            fund: 財報長表 [symbol, date, eps]，已依 symbol、date 排序
+            prices: 股價長表 [symbol, date, close]
+
+        Returns:
+            index 為 symbol 的 PE 相對值 (無股價的股票不在結果中)
+        """
+        # 1. TTM EPS：同檔連續四季加總 (任一季缺值則為 NaN，同 rolling(4).sum())
+        eps = fund['eps'].to_numpy(dtype=np.float64)
+        quarter_no = fund.groupby('symbol', sort=False).cumcount().to_numpy()
+        ttm_eps = np.full(len(eps), np.nan)
+        if len(eps) >= 4:
+            ttm_eps[3:] = ((eps[:-3] + eps[1:-2]) + eps[2:-1]) + eps[3:]
+        ttm_eps[quarter_no < 3] = np.nan
+        right = pd.DataFrame({
+            'symbol': fund['symbol'].to_numpy(),
+            'date': pd.to_datetime(fund['date']).to_numpy(),
+            'ttm_eps': ttm_eps,
+        }).dropna().sort_values('date', kind='stable')
+
+        # 2. 每個交易日對應當時最新的 TTM EPS (merge_asof 要求兩側皆依日期排序)
+        left = prices[['symbol', 'date', 'close']].assign(date=pd.to_datetime(prices['date']))
+        left = left.sort_values('date', kind='stable')
+        merged = pd.merge_asof(left, right, on='date', by='symbol', direction='backward')
+        merged = merged.sort_values('symbol', kind='stable')  # 各檔內仍依日期排序
+        if merged.empty:
+            return pd.Series(dtype=np.float64)
+
+        # 3. 以 NumPy 陣列整批處理 (各檔為連續區段)：PE 直接覆寫收盤價陣列，不另建欄位
+        codes, names = pd.factorize(merged['symbol'])
+        pe = merged['close'].to_numpy(dtype=np.float64, copy=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.divide(pe, merged['ttm_eps'].to_numpy(dtype=np.float64), out=pe)
+        last_rows = np.append(np.flatnonzero(np.diff(codes)), len(codes) - 1)
+        cur = pe[last_rows]
+
+        # 4. 近三年正值 PE：各檔正值序列只取最後 252 * 3 筆 (同 tail)
+        positive = pe > 0
+        pos_codes = codes[positive]
+        pos_pe = pe[positive]
+        counts = np.bincount(pos_codes, minlength=len(names))
+        ends = np.cumsum(counts)
+        recent = ends[pos_codes] - np.arange(len(pos_codes)) <= 252 * 3
+        pos_codes, pos_pe = pos_codes[recent], pos_pe[recent]
+        counts = np.minimum(counts, 252 * 3)
+
+        # 5. 平均與樣本標準差 (兩段式計算，同 Series.mean / std)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_pe = np.bincount(pos_codes, weights=pos_pe, minlength=len(names)) / counts
+            deviation = np.subtract(pos_pe, mean_pe[pos_codes], out=pos_pe)
+            np.multiply(deviation, deviation, out=deviation)
+            std_pe = np.sqrt(np.bincount(pos_codes, weights=deviation, minlength=len(names)) / (counts - 1))
+            relative = np.select(
+                [counts == 0, np.isnan(cur) | (cur <= 0), std_pe > 0, mean_pe > 0],
+                [1.0, 2.0, (cur - mean_pe) / std_pe, cur / mean_pe],
+                1.0
+            )
+        return pd.Series(relative, index=pd.Index(names))
+
+    def _fingerprint(self, symbol: str, fund_df: Optional[pd.DataFrame], present: pd.DataFrame,
+                     price_df: Optional[pd.DataFrame]) -> str:
+        """以 blake2b 雜湊個股財報與股價內容，作為分數儲存的鍵"""
+        digest = hashlib.blake2b(SCORE_STORE_VERSION.encode(), digest_size=8)
+        if fund_df is not None:
+            fund = fund_df.reindex(columns=['date', *FUNDAMENTAL_COLUMNS])
+            digest.update(pd.util.hash_pandas_object(fund, index=False).to_numpy().tobytes())
+            digest.update(present.loc[symbol].to_numpy(dtype=bool).tobytes())
+        if price_df is not None:
+            price = price_df.reindex(columns=['date', 'close'])
+            digest.update(pd.util.hash_pandas_object(price, index=False).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    def _load_score_store(self) -> Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]]:
+        """首次使用時載入分數儲存檔 {(symbol, 指紋): (原始值, 失敗標記)}"""
+        if self._score_store is not None:
+            return self._score_store
+
+        with self._lock:
+            if self._score_store is not None:
+                return self._score_store
+            store = {}
+            if self.score_store_path.exists():
+                try:
+                    stored = pd.read_parquet(self.score_store_path)
+                    factor_names = self._factor_names
+                    raw = stored[factor_names].to_numpy(dtype=np.float64)
+                    failed = stored[[f"{name}_failed" for name in factor_names]].to_numpy(dtype=bool)
+                    keys = zip(stored['symbol'], stored['fingerprint'])
+                    store = dict(zip(keys, zip(raw, failed)))
+                except Exception as e:
+                    self.logger.warning(f"讀取分數儲存失敗，重新計算: {e}")
+            self._score_store = store
+        return self._score_store
+
+    def flush_cache(self):
+        """將新計算的因子原始值寫回分數儲存檔 (每檔只保留最新指紋)"""
+        if self.score_store_path is None or not self._score_store_dirty:
+            return
+
+        latest = {symbol: (fp, values) for (symbol, fp), values in self._score_store.items()}
+        factor_names = self._factor_names
+        df = pd.DataFrame({
+            'symbol': list(latest),
+            'fingerprint': [fp for fp, _ in latest.values()],
+        })
+        raw = np.array([values[0] for _, values in latest.values()], dtype=np.float64).reshape(-1, len(factor_names))
+        failed = np.array([values[1] for _, values in latest.values()], dtype=bool).reshape(-1, len(factor_names))
+        for j, name in enumerate(factor_names):
+            df[name] = raw[:, j]
+            df[f"{name}_failed"] = failed[:, j]
+
+        self.score_store_path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(self.score_store_path, engine='pyarrow', compression='zstd', index=False)
+        self._score_store_dirty = False
+        self.logger.debug("已寫入 %d 檔因子分數儲存: %s", len(df), self.score_store_path)
 
     def calculate_fundamental_details(self, symbol: str) -> Dict[str, any]:
         """
@@ -177,31 +673,64 @@ class FactorEngine:
             'factors': factors
         }
 
+    @contextmanager
+    def screening_scope(self):
+        """
+        篩選區塊：區塊內每檔財報只讀取與轉換一次，離開時清除快取
+
+        Examples:
+            >>> with engine.screening_scope():
+            ...     roe = engine._calculate_roe('2330')
+            ...     fcf = engine._calculate_fcf('2330')  # 不再重讀財報
+        """
+        outermost = self._fund_cache is None
+        if outermost:
+            self._fund_cache = {}
+        try:
+            yield self
+        finally:
+            if outermost:
+                self._fund_cache = None
+
     def _get_fundamental_data(self, symbol: str) -> pd.DataFrame:
         """
         從個股財務分區讀取數據
         
         優先使用真實 FinMind 數據，若無則返回空 DataFrame
         (可在上層邏輯中決定是否呼叫 mock 生成)
+
+        screening_scope 區塊內回傳共用的快取物件，呼叫端不可就地修改
         """
-        df = self.data_manager.read_fundamental_data(symbol)
+        if self._fund_cache is not None and symbol in self._fund_cache:
+            return self._fund_cache[symbol]
+
+        df = self._read_fundamental_data(symbol)
+        if self._fund_cache is not None:
+            self._fund_cache[symbol] = df
+        return df
+
+    def _read_fundamental_data(self, symbol: str) -> pd.DataFrame:
+        """讀取個股財報並確保依日期排序"""
+        df = self.data_manager.read_fundamental_data(symbol, columns=list(FUNDAMENTAL_READ_COLUMNS))
         
         if df.empty:
-            self.logger.debug(f"No fundamental data found for {symbol}")
+            self.logger.debug("No fundamental data found for %s", symbol)
             return pd.DataFrame()
         
         # Log data source
         if len(df) >= 5:
-            self.logger.debug(f"Using real fundamental data for {symbol} ({len(df)} quarters)")
+            self.logger.debug("Using real fundamental data for %s (%d quarters)", symbol, len(df))
         else:
             self.logger.warning(
                 f"Insufficient fundamental data for {symbol} (only {len(df)} quarters, need at least 5)"
             )
         
-        # Ensure date column is datetime
+        # Ensure date column is datetime (已是 datetime / 已排序者略過，免去轉型與複製)
         if 'date' in df.columns:
-            df['date'] = pd.to_datetime(df['date'])
-            df = df.sort_values('date')
+            if not pd.api.types.is_datetime64_any_dtype(df['date']):
+                df['date'] = pd.to_datetime(df['date'])
+            if not df['date'].is_monotonic_increasing:
+                df = df.sort_values('date')
         
         return df
 
@@ -215,56 +744,26 @@ class FactorEngine:
             symbol: 股票代碼
             
         Returns:
-            ROE (百分比)
+            ROE (百分比)；數據不足或股東權益 <= 0 時為 0
         """
         df = self._get_fundamental_data(symbol)
         required = {'net_income', 'equity'}
         
-        # 數據驗證
-        if df.empty or len(df) < 4:
-            self.logger.debug(f"Insufficient data for ROE calculation: {symbol}")
-            return 0.0
-        
         # 檢查數據完整性
-        if not required.issubset(df.columns):
+        if len(df) >= 4 and not required.issubset(df.columns):
             raise ValidationError(f"Missing columns for ROE: {required - set(df.columns)}")
         
-        # 檢查股東權益是否有效
-        if (df['equity'].tail(4) <= 0).any():
-            self.logger.warning(f"{symbol}: Negative/zero equity detected")
-            return 0.0
-        
-        # TTM 淨利: 最近四季加總
-        ttm_net_income = df['net_income'].tail(4).sum()
-        # 平均股東權益: 最近四季的平均值
-        avg_equity = df['equity'].tail(4).mean()
-        
-        if avg_equity <= 0:
-            return 0.0
-            
-        roe = (ttm_net_income / avg_equity) * 100
-        self.logger.debug(f"{symbol} ROE: {roe:.2f}%")
-        return roe
+        return self._statement_factor(symbol, 'roe', df)
 
     def _calculate_eps_yoy(self, symbol: str) -> float:
         """EPS YoY = (本季 EPS - 去年同季 EPS) ÷ |去年同季 EPS| × 100%"""
-        df = self._get_fundamental_data(symbol)
-        if df.empty or 'eps' not in df.columns or len(df) < 5:
-            return 0.0
-        
-        latest_eps = df.iloc[-1]['eps']
-        yoy_eps = df.iloc[-5]['eps']
-        
-        if abs(yoy_eps) < 0.001:
-            return 100.0 if latest_eps > 0 else 0.0
-            
-        return ((latest_eps - yoy_eps) / abs(yoy_eps)) * 100
+        return self._statement_factor(symbol, 'eps_yoy')
 
     def _calculate_fcf(self, symbol: str) -> float:
         """
         計算自由現金流 (Free Cash Flow)
         
-        FCF = 營業現金流 (TTM) - 資本支出 (TTM)
+        FCF = 營業現金流 (TTM) - 資本支出 (TTM)，缺失值視為 0
         
         Args:
             symbol: 股票代碼
@@ -272,58 +771,19 @@ class FactorEngine:
         Returns:
             自由現金流（元）
         """
-        df = self._get_fundamental_data(symbol)
-        required = {'operating_cash_flow', 'capital_expenditure'}
-        
-        if df.empty or not required.issubset(df.columns) or len(df) < 4:
-            self.logger.debug(f"Insufficient data for FCF calculation: {symbol}")
-            return 0.0
-        
-        # 處理缺失值：用 0 填充
-        df_clean = df[['operating_cash_flow', 'capital_expenditure']].fillna(0)
-        
-        ttm_ocf = df_clean['operating_cash_flow'].tail(4).sum()
-        ttm_capex = df_clean['capital_expenditure'].tail(4).sum()
-        
-        fcf = ttm_ocf - ttm_capex
-        self.logger.debug(f"{symbol} FCF: {fcf / 1e8:.2f}億")
-        return fcf
+        return self._statement_factor(symbol, 'fcf')
 
     def _calculate_gross_margin_trend(self, symbol: str) -> float:
         """毛利率趨勢: 最近一季 vs 去年同季 (單位: %)"""
-        df = self._get_fundamental_data(symbol)
-        required = {'gross_profit', 'revenue'}
-        if df.empty or not required.issubset(df.columns) or len(df) < 5:
-            return 0.0
-        
-        df['margin'] = (df['gross_profit'] / df['revenue']) * 100
-        latest_margin = df.iloc[-1]['margin']
-        yoy_margin = df.iloc[-5]['margin']
-        
-        return latest_margin - yoy_margin
+        return self._statement_factor(symbol, 'gross_margin_trend')
 
     def _calculate_debt_ratio(self, symbol: str) -> float:
         """負債比率 = 總負債 ÷ 總資產 × 100%"""
-        df = self._get_fundamental_data(symbol)
-        required = {'total_liabilities', 'total_assets'}
-        if df.empty or not required.issubset(df.columns):
-            return 100.0
-            
-        latest = df.iloc[-1]
-        assets = latest['total_assets']
-        return (latest['total_liabilities'] / assets * 100) if assets > 0 else 100.0
+        return self._statement_factor(symbol, 'debt_ratio')
 
     def _calculate_revenue_yoy(self, symbol: str) -> float:
         """營收年增率 (最近一季 vs 去年同季)"""
-        df = self._get_fundamental_data(symbol)
-        if df.empty or 'revenue' not in df.columns or len(df) < 5:
-            return 0.0
-            
-        latest_rev = df.iloc[-1]['revenue']
-        yoy_rev = df.iloc[-5]['revenue']
-        
-        if yoy_rev <= 0: return 0.0
-        return ((latest_rev - yoy_rev) / yoy_rev) * 100
+        return self._statement_factor(symbol, 'revenue_yoy')
 
     def _calculate_pe_relative(self, symbol: str) -> float:
         """
@@ -339,11 +799,15 @@ class FactorEngine:
         
         if price_df.empty or fund_df.empty or 'eps' not in fund_df.columns or len(fund_df) < 5:
             return 1.0
-            
+
+        return self._pe_relative(price_df, fund_df)
+
+    def _pe_relative(self, price_df: pd.DataFrame, fund_df: pd.DataFrame) -> float:
+        """由單檔價格與財報計算 PE 相對值 (不修改傳入的 DataFrame)"""
         # 1. 建立歷史 PE 序列
         # 價格數據是每日的，財報是每季的。我們將價格與財報按日期 merge
-        price_df['date'] = pd.to_datetime(price_df['date'])
-        fund_df['date'] = pd.to_datetime(fund_df['date'])
+        price_df = price_df.assign(date=pd.to_datetime(price_df['date']))
+        fund_df = fund_df[['date', 'eps']].assign(date=pd.to_datetime(fund_df['date']))
         
         # 為了計算 TTM EPS，我們對 fund_df 進行 rolling sum
         fund_df = fund_df.sort_values('date')
@@ -367,7 +831,7 @@ class FactorEngine:
             
         mean_pe = pe_series.mean()
         std_pe = pe_series.std()
-        current_pe = merged['pe'].iloc[-1]
+        current_pe = merged['pe'].iat[-1]
         
         if pd.isna(current_pe) or current_pe <= 0:
             return 2.0 # PE 無意義，給予較重處份
@@ -383,6 +847,31 @@ class FactorEngine:
             
         return relative_val
 
+    def _score_factor_vec(self, factor_name: str, values: np.ndarray) -> np.ndarray:
+        """
+        將一整批因子原始值轉換為 1-5 分 (NaN 或低於所有門檻者為 1 分)
+
+        Args:
+            factor_name: 因子名稱
+            values: 因子原始值陣列
+
+        Returns:
+            評分陣列 (int8)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        table = _SCORE_TABLE.get(factor_name)
+        if table is None:
+            self.logger.warning(f"No scoring rules found for factor: {factor_name}")
+            return np.full(values.shape, 3, dtype=np.int8)  # 預設中等分數
+
+        thresholds, scores = table
+        if factor_name in _REVERSE:
+            values = -values
+        # side='right' 取最後一個 <= 原始值的門檻，等同依序比對 raw_value >= threshold
+        idx = np.searchsorted(thresholds, values, side='right') - 1
+        matched = (idx >= 0) & ~np.isnan(values)
+        return np.where(matched, scores[np.maximum(idx, 0)], 1).astype(np.int8)
+
     def _score_factor(self, factor_name: str, raw_value: float) -> int:
         """
         將因子原始值轉換為 1-5 分
@@ -396,51 +885,7 @@ class FactorEngine:
         Returns:
             評分 (1-5 分)
         """
-        # 完整評分規則：涵蓋所有 7 個因子
-        scoring_rules = {
-            # ROE (%) - 越高越好
-            'roe': [(20, 5), (15, 4), (10, 3), (5, 2), (-float('inf'), 1)],
-            
-            # EPS YoY (%) - 越高越好
-            'eps_yoy': [(30, 5), (15, 4), (0, 3), (-10, 2), (-float('inf'), 1)],
-            
-            # FCF (億) - 越高越好，以億為單位
-            'fcf': [(5_000_000_000, 5), (1_000_000_000, 4), (0, 3), (-1_000_000_000, 2), (-float('inf'), 1)],
-            
-            # Gross Margin Trend (%) - 毛利率變化，越高越好
-            'gross_margin_trend': [(2.0, 5), (0.5, 4), (-0.5, 3), (-2.0, 2), (-float('inf'), 1)],
-            
-            # Revenue YoY (%) - 越高越好
-            'revenue_yoy': [(20, 5), (10, 4), (0, 3), (-5, 2), (-float('inf'), 1)],
-            
-            # Debt Ratio (%) - 越低越好（反向評分）
-            'debt_ratio': [(30, 5), (50, 4), (70, 3), (85, 2), (float('inf'), 1)],
-            
-            # PE Relative (標準差偏離) - 越低越好，負值表示被低估
-            'pe_relative': [(-1.0, 5), (0.0, 4), (1.0, 3), (2.0, 2), (float('inf'), 1)]
-        }
-
-        rules = scoring_rules.get(factor_name, [])
-        
-        if not rules:
-            self.logger.warning(f"No scoring rules found for factor: {factor_name}")
-            return 3  # 預設中等分數
-        
-        # 反向評分因子（越低越好）
-        reverse_factors = ['debt_ratio', 'pe_relative']
-        
-        for threshold, score in rules:
-            if factor_name in reverse_factors:
-                # 越低越好：raw_value <= threshold 才能得分
-                if raw_value <= threshold:
-                    return score
-            else:
-                # 越高越好：raw_value >= threshold 才能得分
-                if raw_value >= threshold:
-                    return score
-        
-        return 1  # 最低分
-
+        return int(self._score_factor_vec(factor_name, np.array([raw_value], dtype=np.float64))[0])
 
 
 if __name__ == '__main__':
@@ -0,0 +1,191 @@
+"""
+基本面因子數值核心
+
+以 (股票數, 5) 季度視窗陣列整批計算 6 個財報因子原始值 (PE 相對值除外)：
+第 0 欄為最新一季、第 4 欄為去年同季，不足 5 季者以 NaN 補齊。
+
+numba 為選用依賴：安裝時以 JIT 編譯的逐檔迴圈計算，否則退回 NumPy 向量運算，
+兩者結果一致 (缺值規則同 pandas：加總略過 NaN，NaN 比較皆為 False)。
+"""
+
+from typing import Tuple
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# 輸出欄位順序
+RAW_FACTORS = ('roe', 'eps_yoy', 'fcf', 'gross_margin_trend', 'debt_ratio', 'revenue_yoy')
+
+# has 矩陣的欄位順序 (同 src.factors.FUNDAMENTAL_COLUMNS)
+NET_INCOME, EQUITY, EPS, REVENUE, GROSS_PROFIT, OCF, CAPEX, LIABILITIES, ASSETS = range(9)
+
+
+def _compute_raw_factors_numpy(n_rows, has, net_income, equity, eps, revenue, gross_profit,
+                               ocf, capex, liabilities, assets):
+    """NumPy 版本：np.select 依序取第一個成立的條件，對應單檔計算的提前返回順序"""
+    raw = np.empty((len(n_rows), len(RAW_FACTORS)), dtype=np.float64)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # ROE: 數據不足 -> 0；缺欄位 -> 計算失敗；股東權益 <= 0 -> 0
+        equity4 = equity[:, :4]
+        avg_equity = np.nansum(equity4, axis=1) / np.count_nonzero(~np.isnan(equity4), axis=1)
+        roe_missing = ~(has[:, NET_INCOME] & has[:, EQUITY])
+        raw[:, 0] = np.select(
+            [n_rows < 4, roe_missing, (equity4 <= 0).any(axis=1), avg_equity <= 0],
+            [0.0, np.nan, 0.0, 0.0],
+            np.nansum(net_income[:, :4], axis=1) / avg_equity * 100
+        )
+        roe_failed = (n_rows >= 4) & roe_missing
+
+        # EPS YoY: 去年同季近零時依本季正負給 100 / 0
+        eps_now, eps_prev = eps[:, 0], eps[:, 4]
+        raw[:, 1] = np.select(
+            [(n_rows < 5) | ~has[:, EPS], np.abs(eps_prev) < 0.001],
+            [0.0, np.where(eps_now > 0, 100.0, 0.0)],
+            (eps_now - eps_prev) / np.abs(eps_prev) * 100
+        )
+
+        # FCF: 近四季營業現金流 - 資本支出 (缺值視為 0)
+        raw[:, 2] = np.where(
+            (n_rows >= 4) & has[:, OCF] & has[:, CAPEX],
+            np.nansum(ocf[:, :4], axis=1) - np.nansum(capex[:, :4], axis=1),
+            0.0
+        )
+
+        # 毛利率趨勢: 最近一季 vs 去年同季
+        raw[:, 3] = np.where(
+            (n_rows >= 5) & has[:, GROSS_PROFIT] & has[:, REVENUE],
+            gross_profit[:, 0] / revenue[:, 0] * 100 - gross_profit[:, 4] / revenue[:, 4] * 100,
+            0.0
+        )
+
+        # 負債比率: 無數據或總資產 <= 0 -> 100
+        raw[:, 4] = np.select(
+            [(n_rows < 1) | ~(has[:, LIABILITIES] & has[:, ASSETS]), assets[:, 0] > 0],
+            [100.0, liabilities[:, 0] / assets[:, 0] * 100],
+            100.0
+        )
+
+        # 營收年增率: 去年同季營收 <= 0 -> 0
+        rev_now, rev_prev = revenue[:, 0], revenue[:, 4]
+        raw[:, 5] = np.select(
+            [(n_rows < 5) | ~has[:, REVENUE], rev_prev <= 0],
+            [0.0, 0.0],
+            (rev_now - rev_prev) / rev_prev * 100
+        )
+
+    return raw, roe_failed
+
+
+if njit is not None:
+    # error_model='numpy'：除以零得到 inf / NaN 而非拋出例外；不開 fastmath 以保留 NaN 語意
+    @njit(cache=True, error_model='numpy')
+    def _compute_raw_factors_jit(n_rows, has, net_income, equity, eps, revenue, gross_profit,
+                                 ocf, capex, liabilities, assets):
+        """_compute_raw_factors_numpy 的 Numba 版本 (逐檔單次迴圈，無中間陣列)"""
+        n = n_rows.shape[0]
+        raw = np.empty((n, 6), dtype=np.float64)
+        roe_failed = np.zeros(n, dtype=np.bool_)
+
+        for i in range(n):
+            rows = n_rows[i]
+
+            # ROE
+            if rows < 4:
+                raw[i, 0] = 0.0
+            elif not (has[i, NET_INCOME] and has[i, EQUITY]):
+                raw[i, 0] = np.nan
+                roe_failed[i] = True
+            else:
+                non_positive = False
+                equity_sum = 0.0
+                equity_count = 0
+                income_sum = 0.0
+                for k in range(4):
+                    e = equity[i, k]
+                    if e <= 0:
+                        non_positive = True
+                    if not np.isnan(e):
+                        equity_sum += e
+                        equity_count += 1
+                    v = net_income[i, k]
+                    if not np.isnan(v):
+                        income_sum += v
+                avg_equity = equity_sum / equity_count if equity_count > 0 else np.nan
+                if non_positive or avg_equity <= 0:
+                    raw[i, 0] = 0.0
+                else:
+                    raw[i, 0] = income_sum / avg_equity * 100
+
+            # EPS YoY
+            if rows < 5 or not has[i, EPS]:
+                raw[i, 1] = 0.0
+            else:
+                eps_now = eps[i, 0]
+                eps_prev = eps[i, 4]
+                if abs(eps_prev) < 0.001:
+                    raw[i, 1] = 100.0 if eps_now > 0 else 0.0
+                else:
+                    raw[i, 1] = (eps_now - eps_prev) / abs(eps_prev) * 100
+
+            # FCF
+            if rows < 4 or not (has[i, OCF] and has[i, CAPEX]):
+                raw[i, 2] = 0.0
+            else:
+                fcf = 0.0
+                for k in range(4):
+                    if not np.isnan(ocf[i, k]):
+                        fcf += ocf[i, k]
+                capex_sum = 0.0
+                for k in range(4):
+                    if not np.isnan(capex[i, k]):
+                        capex_sum += capex[i, k]
+                raw[i, 2] = fcf - capex_sum
+
+            # 毛利率趨勢
+            if rows < 5 or not (has[i, GROSS_PROFIT] and has[i, REVENUE]):
+                raw[i, 3] = 0.0
+            else:
+                raw[i, 3] = (gross_profit[i, 0] / revenue[i, 0] * 100
+                             - gross_profit[i, 4] / revenue[i, 4] * 100)
+
+            # 負債比率
+            if rows < 1 or not (has[i, LIABILITIES] and has[i, ASSETS]) or not assets[i, 0] > 0:
+                raw[i, 4] = 100.0
+            else:
+                raw[i, 4] = liabilities[i, 0] / assets[i, 0] * 100
+
+            # 營收年增率
+            if rows < 5 or not has[i, REVENUE] or revenue[i, 4] <= 0:
+                raw[i, 5] = 0.0
+            else:
+                raw[i, 5] = (revenue[i, 0] - revenue[i, 4]) / revenue[i, 4] * 100
+
+        return raw, roe_failed
+
+    _kernel = _compute_raw_factors_jit
+else:
+    _kernel = _compute_raw_factors_numpy
+
+
+def compute_raw_factors(n_rows: np.ndarray, has: np.ndarray,
+                        net_income: np.ndarray, equity: np.ndarray, eps: np.ndarray,
+                        revenue: np.ndarray, gross_profit: np.ndarray, ocf: np.ndarray,
+                        capex: np.ndarray, liabilities: np.ndarray,
+                        assets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    整批計算財報因子原始值
+
+    Args:
+        n_rows: 各檔總季數 (int64)
+        has: 各檔是否具備各財報欄位 (股票數, 9)，欄位順序同 FUNDAMENTAL_COLUMNS
+        其餘: 各欄位的 (股票數, 5) 季度視窗 (float64)
+
+    Returns:
+        (raw, roe_failed): (股票數, 6) 原始值 (欄位順序同 RAW_FACTORS) 與 ROE 缺欄位標記
+    """
+    return _kernel(n_rows, has, net_income, equity, eps, revenue, gross_profit,
+                   ocf, capex, liabilities, assets)
@@ -10,18 +10,92 @@ FinMind API 客戶端模組
 參考：Implementation Plan - FinMind Integration
 """
 
+import functools
 import time
+import random
 import logging
 import threading
-from typing import Optional, List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, List, Dict, Tuple
 from datetime import datetime, timedelta
 import pandas as pd
 from FinMind.data import DataLoader
 
+# 股票清單快取有效期 (秒)
+STOCK_LIST_TTL = 24 * 60 * 60
+
+
+def _normalize_date(df: pd.DataFrame) -> None:
+    """
+    將 date 欄位就地統一為 'YYYY-MM-DD' 字串
+
+    已是字串者不再複製；datetime 以 dt.strftime 單次向量化格式化，取代逐元素 str()。
+    """
+    if 'date' not in df.columns:
+        return
+    col = df['date']
+    if pd.api.types.is_datetime64_any_dtype(col):
+        df['date'] = col.dt.strftime('%Y-%m-%d')
+    elif not (pd.api.types.is_object_dtype(col) or pd.api.types.is_string_dtype(col)):
+        df['date'] = col.astype(str)
+
+
+# 磁碟快取：資料區間結束日早於此天數者視為不再變動 (財報最晚於季後約 90 天公告)，否則僅快取一天
+HISTORICAL_AFTER_DAYS = 120
+RECENT_CACHE_TTL = 24 * 60 * 60
+
+
+def _disk_cached(func):
+    """
+    以 parquet 檔快取 (symbol, start_date, end_date) 查詢結果 (需設定 FinMindClient.cache_dir)
+
+    快取命中時不呼叫 API、不消耗速率限制令牌；讀寫快取失敗時退回直接查詢。
+    查詢結果為空時不寫入快取。
+    """
+    @functools.wraps(func)
+    def wrapper(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+        if self.cache_dir is None:
+            return func(self, symbol, start_date, end_date)
+
+        path = self.cache_dir / func.__name__ / f"{symbol}_{start_date}_{end_date}.parquet"
+        if _is_cache_fresh(path, end_date):
+            try:
+                return pd.read_parquet(path)
+            except Exception as e:
+                self.logger.warning(f"讀取 FinMind 快取失敗，重新查詢: {e}")
+
+        df = func(self, symbol, start_date, end_date)
+        # 空結果可能來自暫時性錯誤 (額度用盡、權限不足)，不寫入快取以免歷史區間永久命中空表
+        if df.empty:
+            return df
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(path, engine='pyarrow', index=False)
+        except Exception as e:
+            self.logger.warning(f"寫入 FinMind 快取失敗: {e}")
+        return df
+    return wrapper
+
+
+def _is_cache_fresh(path: Path, end_date: str) -> bool:
+    """快取檔是否可用：歷史區間永久有效，涵蓋近期的區間於 RECENT_CACHE_TTL 內有效"""
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return False
+    if end_date < (datetime.now() - timedelta(days=HISTORICAL_AFTER_DAYS)).strftime('%Y-%m-%d'):
+        return True
+    return time.time() - mtime < RECENT_CACHE_TTL
+
+
 class RateLimiter:
     """
-    API 請求速率限制器
+    API 請求速率限制器 (Token Bucket)
     FinMind 免費版限制: 3 requests/second
+
+    令牌以 max_requests / time_window 的速率補充，上限 max_requests；
+    每次請求 O(1) 取用一個令牌，不需維護時間戳列表。
     """
     def __init__(self, max_requests: int = 3, time_window: float = 1.0):
         """
@@ -33,32 +107,25 @@ class RateLimiter:
         """
         self.max_requests = max_requests
         self.time_window = time_window
-        self.request_timestamps: List[float] = []
+        self.refill_rate = max_requests / time_window
+        self.tokens: float = float(max_requests)
+        # monotonic 時鐘不受系統時間調整影響
+        self.last_refill = time.monotonic()
         self.lock = threading.Lock()
 
     def wait_if_needed(self) -> None:
         """若超過速率限制則等待"""
         with self.lock:
-            now = time.time()
-            # 清理超時的時間戳
-            self.request_timestamps = [
-                ts for ts in self.request_timestamps 
-                if now - ts < self.time_window
-            ]
-            
-            if len(self.request_timestamps) >= self.max_requests:
-                sleep_time = self.time_window - (now - self.request_timestamps[0])
-                if sleep_time > 0:
-                    logging.debug(f"Rate limit reached, waiting {sleep_time:.2f}s...")
-                    time.sleep(sleep_time)
-                    # 清理過期時間戳
-                    now = time.time()
-                    self.request_timestamps = [
-                        ts for ts in self.request_timestamps 
-                        if now - ts < self.time_window
-                    ]
-            
-            self.request_timestamps.append(time.time())
+            now = time.monotonic()
+            self.tokens = min(self.max_requests, self.tokens + (now - self.last_refill) * self.refill_rate)
+            self.last_refill = now
+            # 先預扣令牌 (可為負值，代表排隊中的請求)，等待在鎖外進行，不阻塞其他執行緒計算
+            self.tokens -= 1.0
+            sleep_time = -self.tokens / self.refill_rate if self.tokens < 0 else 0.0
+
+        if sleep_time > 0:
+            logging.debug("Rate limit reached, waiting %.2fs...", sleep_time)
+            time.sleep(sleep_time)
 
 
 class APIErrorHandler:
@@ -74,6 +141,7 @@ class APIErrorHandler:
             delay: Initial delay in seconds (doubles each retry)
         """
         def decorator(func):
+            @functools.wraps(func)
             def wrapper(*args, **kwargs):
                 for attempt in range(max_retries):
                     try:
@@ -88,10 +156,11 @@ class APIErrorHandler:
                         if attempt < max_retries - 1:
                             # If it's a rate limit, wait significantly longer
                             base_delay = 10.0 if is_rate_limit else delay
-                            wait_time = base_delay * (2 ** attempt)
+                            # 指數退避加上 ±50% 隨機抖動，避免多個執行緒同時重試
+                            wait_time = base_delay * (2 ** attempt) * (0.5 + random.random())
                             logging.warning(
                                 f"{func.__name__} failed (attempt {attempt + 1}/{max_retries}): {e}. "
-                                f"Retrying in {wait_time}s..."
+                                f"Retrying in {wait_time:.1f}s..."
                             )
                             time.sleep(wait_time)
                         else:
@@ -112,17 +181,21 @@ class FinMindClient:
     - 股票清單
     """
     
-    def __init__(self, api_token: str = ""):
+    def __init__(self, api_token: str = "", cache_dir: Optional[Path] = None):
         """
         Initialize FinMind client.
         
         Args:
             api_token: FinMind API token (required for API access)
+            cache_dir: 個股查詢結果的磁碟快取目錄 (跨行程沿用)；None 表示不快取
         """
         self.api_token = api_token
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
         self.data_loader = DataLoader()
         self.data_loader.login_by_token(api_token=api_token) if api_token else None
         self.rate_limiter = RateLimiter(max_requests=3, time_window=1.0)
+        # 股票資訊表快取 (monotonic 時間戳, DataFrame)
+        self._stock_info_cache: Optional[Tuple[float, pd.DataFrame]] = None
         self.logger = logging.getLogger(__name__)
         self.logger.info("FinMind API client initialized")
 
@@ -140,14 +213,9 @@ class FinMindClient:
         Raises:
             Exception: API request failed after retries
         """
-        self.rate_limiter.wait_if_needed()
-        
         try:
-            df = self.data_loader.taiwan_stock_info()
-            
-            if df is None or df.empty:
-                raise ValueError("Empty stock list returned from API")
-            
+            df = self._get_stock_info()
+
             # FinMind uses 'type' column with values: 'twse' (上市) and 'tpex' (上櫃)
             # Filter by market if specified
             if market == "TSE":
@@ -167,6 +235,30 @@ class FinMindClient:
             self.logger.error(f"Failed to fetch stock list: {e}", exc_info=True)
             raise
 
+    def _get_stock_info(self) -> pd.DataFrame:
+        """
+        取得完整股票資訊表 (TTL 快取)
+
+        股票清單每日至多變動一次，快取期間內不再呼叫 API、不消耗速率限制令牌；
+        各市場別皆由同一份資料篩選。回傳的快取物件呼叫端不可就地修改。
+        """
+        cached = self._stock_info_cache
+        if cached is not None and time.monotonic() - cached[0] < STOCK_LIST_TTL:
+            return cached[1]
+
+        self.rate_limiter.wait_if_needed()
+        df = self.data_loader.taiwan_stock_info()
+        if df is None or df.empty:
+            raise ValueError("Empty stock list returned from API")
+
+        # 低基數字串欄位轉為 category (整數代碼 + 共用類別表)，縮小常駐快取的記憶體
+        low_cardinality = [col for col in ('type', 'industry_category') if col in df.columns]
+        df = df.astype({col: 'category' for col in low_cardinality})
+
+        self._stock_info_cache = (time.monotonic(), df)
+        return df
+
+    @_disk_cached
     @APIErrorHandler.retry_on_failure(max_retries=3, delay=2.0)
     def get_financial_statements(
         self, 
@@ -208,9 +300,7 @@ class FinMindClient:
                 self.logger.warning(f"No financial statement data for {symbol} ({start_date} to {end_date})")
                 return pd.DataFrame()
             
-            # Ensure date column is datetime
-            if 'date' in df.columns:
-                df['date'] = df['date'].astype(str)
+            _normalize_date(df)
             
             self.logger.debug(f"Retrieved {len(df)} financial records for {symbol}")
             return df
@@ -219,6 +309,7 @@ class FinMindClient:
             self.logger.error(f"Failed to fetch financial statements for {symbol}: {e}", exc_info=True)
             raise
 
+    @_disk_cached
     @APIErrorHandler.retry_on_failure(max_retries=3, delay=2.0)
     def get_balance_sheet(
         self, 
@@ -257,8 +348,7 @@ class FinMindClient:
                 self.logger.warning(f"No balance sheet data for {symbol}")
                 return pd.DataFrame()
             
-            if 'date' in df.columns:
-                df['date'] = df['date'].astype(str)
+            _normalize_date(df)
             
             self.logger.debug(f"Retrieved {len(df)} balance sheet records for {symbol}")
             return df
@@ -267,6 +357,7 @@ class FinMindClient:
             self.logger.error(f"Failed to fetch balance sheet for {symbol}: {e}", exc_info=True)
             raise
 
+    @_disk_cached
     @APIErrorHandler.retry_on_failure(max_retries=3, delay=2.0)
     def get_cash_flow(
         self, 
@@ -305,8 +396,7 @@ class FinMindClient:
                 self.logger.warning(f"No cash flow data for {symbol}")
                 return pd.DataFrame()
             
-            if 'date' in df.columns:
-                df['date'] = df['date'].astype(str)
+            _normalize_date(df)
             
             self.logger.debug(f"Retrieved {len(df)} cash flow records for {symbol}")
             return df
@@ -315,6 +405,7 @@ class FinMindClient:
             self.logger.error(f"Failed to fetch cash flow for {symbol}: {e}", exc_info=True)
             raise
 
+    @_disk_cached
     @APIErrorHandler.retry_on_failure(max_retries=3, delay=2.0)
     def get_monthly_revenue(
         self, 
@@ -352,8 +443,7 @@ class FinMindClient:
                 self.logger.warning(f"No monthly revenue data for {symbol}")
                 return pd.DataFrame()
             
-            if 'date' in df.columns:
-                df['date'] = df['date'].astype(str)
+            _normalize_date(df)
             
             self.logger.debug(f"Retrieved {len(df)} monthly revenue records for {symbol}")
             return df
@@ -362,6 +452,7 @@ class FinMindClient:
             self.logger.error(f"Failed to fetch monthly revenue for {symbol}: {e}", exc_info=True)
             raise
 
+    @_disk_cached
     @APIErrorHandler.retry_on_failure(max_retries=3, delay=2.0)
     def get_daily_price(
         self, 
@@ -379,8 +470,7 @@ class FinMindClient:
             )
             if df is None or df.empty:
                 return pd.DataFrame()
-            if 'date' in df.columns:
-                df['date'] = df['date'].astype(str)
+            _normalize_date(df)
             return df
         except KeyError as e:
             if str(e) == "'data'":
@@ -391,6 +481,7 @@ class FinMindClient:
             self.logger.error(f"Failed to fetch daily price for {symbol}: {e}", exc_info=True)
             raise
 
+    @_disk_cached
     @APIErrorHandler.retry_on_failure(max_retries=3, delay=2.0)
     def get_institutional_investors(
         self, 
@@ -408,8 +499,7 @@ class FinMindClient:
             )
             if df is None or df.empty:
                 return pd.DataFrame()
-            if 'date' in df.columns:
-                df['date'] = df['date'].astype(str)
+            _normalize_date(df)
             return df
         except KeyError as e:
             if str(e) == "'data'":
@@ -437,8 +527,7 @@ class FinMindClient:
             )
             if df is None or df.empty:
                 return pd.DataFrame()
-            if 'date' in df.columns:
-                df['date'] = df['date'].astype(str)
+            _normalize_date(df)
             return df
         except KeyError as e:
             if str(e) == "'data'":
@@ -467,8 +556,7 @@ class FinMindClient:
             )
             if df is None or df.empty:
                 return pd.DataFrame()
-            if 'date' in df.columns:
-                df['date'] = df['date'].astype(str)
+            _normalize_date(df)
             return df
         except KeyError as e:
             if str(e) == "'data'":
@@ -505,16 +593,120 @@ class FinMindClient:
         """
         self.logger.info(f"Fetching comprehensive fundamentals for {symbol} ({start_date} to {end_date})")
         
-        result = {
-            'financial_statement': self.get_financial_statements(symbol, start_date, end_date),
-            'balance_sheet': self.get_balance_sheet(symbol, start_date, end_date),
-            'cash_flow': self.get_cash_flow(symbol, start_date, end_date),
-            'monthly_revenue': self.get_monthly_revenue(symbol, start_date, end_date)
+        fetchers = {
+            'financial_statement': self.get_financial_statements,
+            'balance_sheet': self.get_balance_sheet,
+            'cash_flow': self.get_cash_flow,
+            'monthly_revenue': self.get_monthly_revenue
         }
-        
+
+        # 四份報表互相獨立，並行發出請求；速率仍由共用的 rate_limiter 控制
+        with ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+            futures = {
+                name: executor.submit(fetch, symbol, start_date, end_date)
+                for name, fetch in fetchers.items()
+            }
+            result = {name: future.result() for name, future in futures.items()}
+
         return result
 
 
+    def _fetch_all_stocks(self, fetch, label: str, start_date: str, end_date: str) -> Dict[str, pd.DataFrame]:
+        """
+        以單次 API 請求取得全市場的某一資料集，依 stock_id 分組
+
+        FinMind 未指定 stock_id 時回傳所有股票 (需具備對應權限的 token)，
+        以一個速率限制令牌取代逐檔各一次請求。
+        """
+        self.rate_limiter.wait_if_needed()
+
+        try:
+            df = fetch(start_date=start_date, end_date=end_date)
+
+            if df is None or df.empty:
+                self.logger.warning(f"No {label} data for all stocks ({start_date} to {end_date})")
+                return {}
+
+            _normalize_date(df)
+
+            groups = {
+                str(stock_id): group.reset_index(drop=True)
+                for stock_id, group in df.groupby('stock_id', sort=False)
+            }
+            self.logger.debug("Retrieved %d %s records for %d stocks", len(df), label, len(groups))
+            return groups
+
+        except Exception as e:
+            self.logger.error(f"Failed to fetch {label} for all stocks: {e}", exc_info=True)
+            raise
+
+    @APIErrorHandler.retry_on_failure(max_retries=3, delay=2.0)
+    def get_financial_statements_bulk(self, start_date: str, end_date: str) -> Dict[str, pd.DataFrame]:
+        """獲取全市場財務報表數據 (單次請求)，回傳 {symbol: DataFrame}"""
+        return self._fetch_all_stocks(
+            self.data_loader.taiwan_stock_financial_statement, 'financial statement', start_date, end_date
+        )
+
+    @APIErrorHandler.retry_on_failure(max_retries=3, delay=2.0)
+    def get_balance_sheet_bulk(self, start_date: str, end_date: str) -> Dict[str, pd.DataFrame]:
+        """獲取全市場資產負債表 (單次請求)，回傳 {symbol: DataFrame}"""
+        return self._fetch_all_stocks(
+            self.data_loader.taiwan_stock_balance_sheet, 'balance sheet', start_date, end_date
+        )
+
+    @APIErrorHandler.retry_on_failure(max_retries=3, delay=2.0)
+    def get_cash_flow_bulk(self, start_date: str, end_date: str) -> Dict[str, pd.DataFrame]:
+        """獲取全市場現金流量表 (單次請求)，回傳 {symbol: DataFrame}"""
+        return self._fetch_all_stocks(
+            self.data_loader.taiwan_stock_cash_flows_statement, 'cash flow', start_date, end_date
+        )
+
+    @APIErrorHandler.retry_on_failure(max_retries=3, delay=2.0)
+    def get_monthly_revenue_bulk(self, start_date: str, end_date: str) -> Dict[str, pd.DataFrame]:
+        """獲取全市場月營收 (單次請求)，回傳 {symbol: DataFrame}"""
+        return self._fetch_all_stocks(
+            self.data_loader.taiwan_stock_month_revenue, 'monthly revenue', start_date, end_date
+        )
+
+    def get_comprehensive_fundamentals_bulk(
+        self,
+        symbols: List[str],
+        start_date: str,
+        end_date: str
+    ) -> Dict[str, Dict[str, pd.DataFrame]]:
+        """
+        批次獲取多檔股票的完整基本面數據 (每份報表一次全市場請求)
+
+        Args:
+            symbols: 股票代碼列表
+            start_date: 開始日期
+            end_date: 結束日期
+
+        Returns:
+            {symbol: 同 get_comprehensive_fundamentals 的報表字典}；無數據的報表為空 DataFrame
+        """
+        self.logger.info(f"Fetching comprehensive fundamentals for all stocks ({start_date} to {end_date})")
+
+        fetchers = {
+            'financial_statement': self.get_financial_statements_bulk,
+            'balance_sheet': self.get_balance_sheet_bulk,
+            'cash_flow': self.get_cash_flow_bulk,
+            'monthly_revenue': self.get_monthly_revenue_bulk
+        }
+
+        with ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+            futures = {
+                name: executor.submit(fetch, start_date, end_date)
+                for name, fetch in fetchers.items()
+            }
+            datasets = {name: future.result() for name, future in futures.items()}
+
+        return {
+            symbol: {name: groups.get(symbol, pd.DataFrame()) for name, groups in datasets.items()}
+            for symbol in symbols
+        }
+
+
 if __name__ == '__main__':
     logging.basicConfig(
         level=logging.INFO,
@@ -10,8 +10,15 @@
 """
 
 import logging
-import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src.utils import json_dumps
+
+# 暫時性錯誤 (限流、伺服器錯誤) 由連線層自動重試
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
 
 
 class NotificationService:
@@ -29,21 +36,42 @@ class NotificationService:
         >>> service.send_line_notify("選股完成")
     """
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, max_retries: int = 3):
         """
         初始化通知服務
 
         Args:
             config: 配置字典，包含 Token 等設定
+            max_retries: 連線失敗或暫時性 HTTP 錯誤的最大重試次數
         """
         self.config = config
         self.logger = logging.getLogger(__name__)
+        self._session = self._build_session(max_retries)
 
-    def send_line_notify(
-        self,
-        message: str,
-        max_retries: int = 3
-    ) -> bool:
+    @staticmethod
+    def _build_session(max_retries: int) -> requests.Session:
+        """
+        建立共用的 HTTP Session
+
+        連線池保持 keep-alive，後續請求免去重新建立 TCP / TLS 連線；
+        重試交由 urllib3 Retry 以指數退避處理 (POST 亦重試)：等待 2、4、8... 秒 (上限 32 秒)
+        並加上最多 1 秒的隨機抖動，避免服務中斷時集中重送；401/403 等用戶端錯誤不重試。
+        """
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=2.0,
+            backoff_max=32,
+            backoff_jitter=1.0,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset({'POST'}),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=retry)
+        session = requests.Session()
+        session.mount('https://', adapter)
+        return session
+
+    def send_line_notify(self, message: str) -> bool:
         """
         發送 Line Notify 通知
         """
@@ -55,23 +83,22 @@ class NotificationService:
         headers = {"Authorization": f"Bearer {token}"}
         payload = {"message": message}
         
-        for attempt in range(max_retries):
-            try:
-                response = requests.post(
-                    "https://notify-api.line.me/api/notify",
-                    headers=headers,
-                    params=payload,
-                    timeout=10
-                )
-                if response.status_code == 200:
-                    self.logger.info("Line Notify 發送成功")
-                    return True
-                else:
-                    self.logger.error(f"Line Notify 失敗: {response.text}", exc_info=True)
-            except Exception as e:
-                self.logger.warning(f"Line Notify 嘗試 {attempt+1} 失敗: {e}")
-                time.sleep(2)
-        return False
+        try:
+            response = self._session.post(
+                "https://notify-api.line.me/api/notify",
+                headers=headers,
+                params=payload,
+                timeout=10
+            )
+            if response.status_code == 200:
+                self.logger.info("Line Notify 發送成功")
+                return True
+            else:
+                self.logger.error(f"Line Notify 失敗: {response.text}", exc_info=True)
+                return False
+        except Exception as e:
+            self.logger.error(f"Line Notify 發送異常: {e}", exc_info=True)
+            return False
 
     def send_telegram(
         self,
@@ -96,7 +123,12 @@ class NotificationService:
         }
 
         try:
-            response = requests.post(url, json=payload, timeout=10)
+            response = self._session.post(
+                url,
+                data=json_dumps(payload),
+                headers={"Content-Type": "application/json"},
+                timeout=10
+            )
             if response.status_code == 200:
                 self.logger.info("Telegram 訊息發送成功")
                 return True
@@ -107,6 +139,22 @@ class NotificationService:
             self.logger.error(f"Telegram 發送異常: {e}", exc_info=True)
             return False
 
+    def broadcast(self, message: str) -> Dict[str, bool]:
+        """
+        同時發送至所有通知管道
+
+        各管道的網路等待互相重疊 (耗時約為最慢者而非總和)；共用同一個連線池。
+
+        Returns:
+            dict: {管道名稱: 是否發送成功}
+        """
+        senders = {
+            'line_notify': self.send_line_notify,
+            'telegram': self.send_telegram
+        }
+        with ThreadPoolExecutor(max_workers=len(senders)) as executor:
+            futures = {name: executor.submit(send, message) for name, send in senders.items()}
+            return {name: future.result() for name, future in futures.items()}
 
 
 if __name__ == '__main__':
@@ -11,14 +11,27 @@ Parquet 數據管理器模組
 
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, List
+import numpy as np
 import pandas as pd
 import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs
 import pyarrow.parquet as pq
 from datetime import datetime
 from src.utils.exceptions import DataNotFoundError
 
+# 個股分區檔每個 row group 的列數 (約一季交易日)，按日期排序後讀取近期區間只需解碼少數 row group
+SYMBOL_ROW_GROUP_SIZE = 64
+
+
+def _is_string_type(data_type: pa.DataType) -> bool:
+    """是否為 Arrow 字串型別 (pandas 3 的 str 欄位寫出為 large_string)"""
+    return pa.types.is_string(data_type) or pa.types.is_large_string(data_type)
+
+
 class ParquetManager:
     """
     Parquet 數據管理器 - 管理時間分區與個股分區
@@ -43,13 +56,58 @@ class ParquetManager:
         
         self.logger = logging.getLogger(__name__)
 
+    @staticmethod
+    def _write_parquet(df: pd.DataFrame, file_path: Path, compression: str = 'snappy', **options):
+        """
+        輔助函數：以 pyarrow 寫入單一 Parquet 檔
+
+        欄位轉換以多執行緒進行，轉換與壓縮寫出皆在 C++ 端執行並釋放 GIL，
+        並行寫入多檔時 (如 _write_grouped_by_symbol) 各執行緒不互相阻塞。
+        一律寫出欄位 min/max 統計，供 _read_parquet_file 依日期略過 row group。
+        """
+        table = pa.Table.from_pandas(df, preserve_index=False, nthreads=os.cpu_count())
+        pq.write_table(table, file_path, compression=compression, use_dictionary=True,
+                       write_statistics=True, data_page_version='2.0', **options)
+
+    @staticmethod
+    def _read_parquet_file(file_path: Path, columns: Optional[List[str]] = None,
+                           start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
+        """
+        輔助函數：讀取單一 Parquet 檔，下推欄位投影與日期區間
+
+        只解碼指定欄位 (檔案中不存在的欄位略過)；日期條件以 row group 的
+        min/max 統計略過整段不在區間內的資料，再於讀取時過濾剩餘列。
+        日期欄非字串 (舊檔) 時改為讀取後以字串比較過濾。
+        """
+        schema = pq.read_schema(file_path)
+        if columns is not None:
+            columns = [col for col in columns if col in schema.names]
+
+        if (start_date is None and end_date is None) or 'date' not in schema.names:
+            return pd.read_parquet(file_path, columns=columns)
+
+        if _is_string_type(schema.field('date').type):
+            filters = [('date', op, value) for op, value in (('>=', start_date), ('<=', end_date)) if value is not None]
+            return pq.read_table(file_path, columns=columns, filters=filters).to_pandas()
+
+        read_columns = columns if columns is None or 'date' in columns else [*columns, 'date']
+        df = pd.read_parquet(file_path, columns=read_columns)
+        dates = df['date'].astype(str)
+        mask = pd.Series(True, index=df.index)
+        if start_date is not None:
+            mask &= dates >= start_date
+        if end_date is not None:
+            mask &= dates <= end_date
+        df = df[mask].reset_index(drop=True)
+        return df if read_columns is columns else df.drop(columns='date')
+
     def write_time_partition(self, data: pd.DataFrame, partition_date: str):
         """寫入時間分區 /data/daily/date=YYYY-MM-DD/"""
         path = self.daily_path / f"date={partition_date}"
         path.mkdir(parents=True, exist_ok=True)
         
         file_path = path / "data.parquet"
-        data.to_parquet(file_path, engine='pyarrow', compression='snappy', index=False)
+        self._write_parquet(data, file_path)
         self.logger.info(f"成功寫入時間分區: {file_path}")
 
     def write_symbol_partition(self, data: pd.DataFrame, symbol: str):
@@ -60,34 +118,68 @@ class ParquetManager:
         # Ensure 'date' column is string before writing
         if 'date' in data.columns:
             data['date'] = data['date'].astype(str)
+            if not data['date'].is_monotonic_increasing:
+                data = data.sort_values('date', kind='stable')
 
         file_path = path / "data.parquet"
-        data.to_parquet(file_path, engine='pyarrow', compression='snappy', index=False)
-        self.logger.debug(f"成功寫入個股分區: {file_path}")
+        self._write_parquet(data, file_path, row_group_size=SYMBOL_ROW_GROUP_SIZE)
+        self.logger.debug("成功寫入個股分區: %s", file_path)
+
+    def read_time_partition(self, start_date: str, end_date: str = None,
+                            columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        讀取時間分區範圍數據
 
-    def read_time_partition(self, start_date: str, end_date: str = None) -> pd.DataFrame:
-        """讀取時間分區範圍數據"""
+        以目錄名稱 date=YYYY-MM-DD 篩選分區 (範圍外的檔案不開啟)，
+        columns 指定時只解碼所需欄位。各檔自帶的 date 欄位型別不一
+        (字串或 datetime)，不套用 hive 分區合併 schema，逐檔讀取後統一轉為字串。
+        """
         if end_date is None:
             end_date = start_date
-            
-        dataset = pq.ParquetDataset(
-            self.daily_path,
-            filters=[('date', '>=', start_date), ('date', '<=', end_date)]
-        )
-        df = dataset.read().to_pandas()
-        # Ensure 'date' column is string for consistency, though it should be if stored as such
-        if 'date' in df.columns:
-            df['date'] = df['date'].astype(str)
-        return df
 
-    def read_symbol_partition(self, symbol: str) -> pd.DataFrame:
-        """讀取個股分區數據"""
+        with os.scandir(self.daily_path) as entries:
+            partitions = sorted(
+                (entry.name.split('=', 1)[1], Path(entry.path) / 'data.parquet')
+                for entry in entries
+                if entry.name.startswith('date=') and entry.is_dir()
+                and start_date <= entry.name.split('=', 1)[1] <= end_date
+            )
+        partitions = [(date_str, file_path) for date_str, file_path in partitions if file_path.exists()]
+        if not partitions:
+            return pd.DataFrame(columns=columns)
+
+        def read_partition(partition) -> pd.DataFrame:
+            date_str, file_path = partition
+            df = self._read_parquet_file(file_path, columns)
+            if 'date' in df.columns:
+                if not pd.api.types.is_string_dtype(df['date']):
+                    df['date'] = df['date'].astype(str)
+            elif columns is None or 'date' in columns:
+                # 檔案未存日期欄位時由分區目錄補齊
+                df['date'] = date_str
+            return df
+
+        # pyarrow 讀檔期間釋放 GIL，多檔以執行緒池重疊 I/O
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            frames = list(executor.map(read_partition, partitions))
+        df = pd.concat(frames, ignore_index=True)
+        return df if columns is None else df[[col for col in columns if col in df.columns]]
+
+    def read_symbol_partition(self, symbol: str, columns: Optional[List[str]] = None,
+                              start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
+        """
+        讀取個股分區數據
+
+        Args:
+            symbol: 股票代碼
+            columns: 只讀取的欄位 (標準化後名稱，如 high / volume)
+            start_date / end_date: 日期區間 (含端點，'YYYY-MM-DD')
+        """
         file_path = self.history_path / f"symbol={symbol}" / "data.parquet"
         if not file_path.exists():
             self.logger.warning(f"找不到股個分區數據: {symbol}")
             return pd.DataFrame()
-        df = pd.read_parquet(file_path)
-        
+
         # 標準化欄位名稱 (處理 FinMind 不同資料源的差異)
         column_mapping = {
             'max': 'high',
@@ -95,6 +187,10 @@ class ParquetManager:
             'Trading_Volume': 'volume',
             'Trading_money': 'amount'
         }
+        if columns is not None:
+            # 同時讀取標準化名稱與其原始名稱，檔案中不存在者略過
+            columns = [*columns, *(raw for raw, std in column_mapping.items() if std in columns)]
+        df = self._read_parquet_file(file_path, columns, start_date, end_date)
         df.rename(columns=column_mapping, inplace=True)
         
         # Ensure 'date' column is string for consistency
@@ -102,6 +198,13 @@ class ParquetManager:
             df['date'] = df['date'].astype(str)
         return df
 
+    def read_prices_bulk(self, symbols: List[str]) -> pd.DataFrame:
+        """批次讀取多檔股票的收盤價 [symbol, date, close] (單次掃描)"""
+        df = self._read_symbol_partitions(self.history_path, symbols, ['symbol', 'date', 'close'])
+        if 'date' in df.columns:
+            df['date'] = df['date'].astype(str)
+        return df
+
     def transpose_to_symbol_partition(self, date_str: str):
         """將時間分區轉置為個股分區 (ETL)"""
         self.logger.info(f"開始轉置 {date_str} 的數據至個股分區...")
@@ -114,98 +217,210 @@ class ParquetManager:
             
         daily_df = pd.read_parquet(daily_file)
         
-        # 2. 按股票代碼遍歷並附加到個股檔案
-        for symbol, group in daily_df.groupby('symbol'):
-            self._append_to_history(symbol, group)
-            
+        # 2. 單次分組後並行附加到各個股檔案 (各檔案彼此獨立)
+        self._write_grouped_by_symbol(daily_df, self._append_to_history, max_workers=8)
+
+
         self.logger.info(f"轉置完成: {date_str}")
 
     def _append_to_history(self, symbol: str, new_data: pd.DataFrame):
         """輔助函數：將新數據附加到個股歷史檔案並去重"""
         path = self.history_path / f"symbol={symbol}"
         path.mkdir(parents=True, exist_ok=True)
-        file_path = path / "data.parquet"
-        
-        if file_path.exists():
+        # 日期統一為字串 (同 write_symbol_partition)，每日分區的 datetime 日期才能走 row group 附加路徑
+        if not pd.api.types.is_string_dtype(new_data['date']):
+            new_data = new_data.assign(date=new_data['date'].astype(str))
+        self._upsert_by_date(path / "data.parquet", new_data)
+
+    def _upsert_by_date(self, file_path: Path, new_data: pd.DataFrame):
+        """
+        輔助函數：將新數據依日期附加至已排序的個股檔案並去重 (同日期以新數據為準)
+
+        依各 row group 的日期 max 統計，完全早於新數據起始日的 row group 原樣逐組複製，
+        只將其後的 row group (含未滿的最後一組) 與新數據合併、去重、排序後重寫，
+        不再整檔轉為 DataFrame；寫入暫存檔後以 os.replace 原子替換。
+        日期欄非字串、缺統計或欄位不一致 (舊檔) 時退回整檔讀取合併。
+        """
+        if not file_path.exists():
+            self._write_parquet(new_data.sort_values('date'), file_path, row_group_size=SYMBOL_ROW_GROUP_SIZE)
+            return
+
+        parquet_file = pq.ParquetFile(file_path)
+        schema = parquet_file.schema_arrow
+        kept_groups = self._row_groups_before(parquet_file, new_data)
+        if kept_groups is None or set(schema.names) != set(new_data.columns):
             history_df = pd.read_parquet(file_path)
-            # 合併並去重
+            if pd.api.types.is_string_dtype(new_data['date']):
+                history_df['date'] = history_df['date'].astype(str)
             combined_df = pd.concat([history_df, new_data]).drop_duplicates(subset=['date'], keep='last')
-            combined_df = combined_df.sort_values('date')
-        else:
-            combined_df = new_data.sort_values('date')
-            
-        combined_df.to_parquet(file_path, engine='pyarrow', compression='snappy', index=False)
+            self._write_parquet(combined_df.sort_values('date'), file_path, row_group_size=SYMBOL_ROW_GROUP_SIZE)
+            return
+
+        tail_groups = range(kept_groups, parquet_file.num_row_groups)
+        tail_df = parquet_file.read_row_groups(tail_groups).to_pandas() if len(tail_groups) else None
+        combined_df = pd.concat([tail_df, new_data]).drop_duplicates(subset=['date'], keep='last')
+        combined_table = pa.Table.from_pandas(combined_df.sort_values('date'), schema=schema, preserve_index=False)
+
+        tmp_path = file_path.with_name(file_path.name + '.tmp')
+        with pq.ParquetWriter(tmp_path, schema, compression='snappy', use_dictionary=True,
+                              write_statistics=True, data_page_version='2.0') as writer:
+            for i in range(kept_groups):
+                writer.write_table(parquet_file.read_row_group(i))
+            writer.write_table(combined_table, row_group_size=SYMBOL_ROW_GROUP_SIZE)
+        os.replace(tmp_path, file_path)
+
+    @staticmethod
+    def _row_groups_before(parquet_file: pq.ParquetFile, new_data: pd.DataFrame) -> Optional[int]:
+        """
+        輔助函數：計算開頭可原樣保留的 row group 數 (日期 max 皆早於新數據起始日)
+
+        最後一組未滿 SYMBOL_ROW_GROUP_SIZE 時併入重寫，避免每日附加產生零碎的小 row group。
+        無法依統計判斷時回傳 None。
+        """
+        schema = parquet_file.schema_arrow
+        if ('date' not in schema.names or not _is_string_type(schema.field('date').type)
+                or not pd.api.types.is_string_dtype(new_data['date'])):
+            return None
+
+        metadata = parquet_file.metadata
+        date_idx = parquet_file.schema.names.index('date')
+        first_new_date = new_data['date'].min()
+        kept = 0
+        for i in range(metadata.num_row_groups):
+            stats = metadata.row_group(i).column(date_idx).statistics
+            if stats is None or not stats.has_min_max:
+                return None
+            if stats.max >= first_new_date:
+                break
+            kept += 1
+        if kept == metadata.num_row_groups and kept and metadata.row_group(kept - 1).num_rows < SYMBOL_ROW_GROUP_SIZE:
+            kept -= 1
+        return kept
 
     def write_fundamental_data(self, df: pd.DataFrame, symbol: str):
         """將基本面數據寫入個股分區"""
         path = self.fundamentals_path / f"symbol={symbol}"
         path.mkdir(parents=True, exist_ok=True)
         
-        # 確保日期為字串
+        # 確保日期為字串，並依日期排序寫入 (讀取端已排序時免再排序)
         if 'date' in df.columns:
             df['date'] = df['date'].astype(str)
-            
+            if not df['date'].is_monotonic_increasing:
+                df = df.sort_values('date', kind='stable')
+
         file_path = path / "data.parquet"
-        df.to_parquet(file_path, index=False)
-        self.logger.debug(f"成功寫入個股基本面數據: {file_path}")
+        # 財報檔案以讀取為主 (驗證、因子計算)，zstd 壓縮率與解壓速度皆優於 snappy
+        self._write_parquet(df, file_path, compression='zstd', compression_level=3)
+        self.logger.debug("成功寫入個股基本面數據: %s", file_path)
 
-    def read_fundamental_data(self, symbol: str) -> pd.DataFrame:
-        """讀取財務報表數據"""
+    def read_fundamental_data(self, symbol: str, columns: Optional[List[str]] = None,
+                              start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
+        """
+        讀取財務報表數據
+
+        Args:
+            symbol: 股票代碼
+            columns: 只讀取的欄位 (投影下推，只解碼所需欄位)；檔案中不存在的欄位略過
+            start_date / end_date: 日期區間 (含端點，'YYYY-MM-DD')
+        """
         file_path = self.fundamentals_path / f"symbol={symbol}" / "data.parquet"
         if not file_path.exists():
             self.logger.warning(f"找不到財務數據: {symbol}")
             return pd.DataFrame()
-        return pd.read_parquet(file_path)
+        return self._read_parquet_file(file_path, columns, start_date, end_date)
+
+    def read_fundamental_data_bulk(self, symbols: List[str], columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """批次讀取多檔股票的財務報表數據 (單次掃描，symbol 欄位由分區路徑補齊)"""
+        return self._read_symbol_partitions(self.fundamentals_path, symbols, columns)
 
     def write_chip_data(self, symbol: str, data: pd.DataFrame):
         """寫入籌碼數據 (三大法人買賣超) - 支援附加與去重"""
         path = self.chips_path / f"symbol={symbol}"
         path.mkdir(parents=True, exist_ok=True)
-        file_path = path / "data.parquet"
-        
-        if file_path.exists():
-            history_df = pd.read_parquet(file_path)
-            # Ensure consistent type for merging
-            history_df['date'] = history_df['date'].astype(str)
-            data['date'] = data['date'].astype(str)
-            
-            combined_df = pd.concat([history_df, data]).drop_duplicates(subset=['date'], keep='last')
-            combined_df = combined_df.sort_values('date')
-        else:
-            data['date'] = data['date'].astype(str)
-            combined_df = data.sort_values('date')
-            
-        combined_df.to_parquet(file_path, engine='pyarrow', compression='snappy', index=False)
+        # Ensure consistent type for merging
+        data['date'] = data['date'].astype(str)
+        self._upsert_by_date(path / "data.parquet", data)
+
+    def write_chip_data_bulk(self, data: pd.DataFrame, max_workers: int = 8):
+        """批次寫入多檔股票的籌碼數據 (依 symbol 分組，並行附加至各個股分區)"""
+        self._write_grouped_by_symbol(data, self.write_chip_data, max_workers)
+
+    def _write_grouped_by_symbol(self, data: pd.DataFrame, writer, max_workers: int):
+        """
+        輔助函數：將多檔股票數據依 symbol 分組後並行寫入
 
-    def read_chip_data(self, symbol: str) -> pd.DataFrame:
-        """讀取籌碼數據"""
+        個股檔案彼此獨立，且 pyarrow 讀寫期間會釋放 GIL，
+        以執行緒池重疊各檔的 I/O；任一檔寫入失敗時拋出例外。
+        """
+        # 以 factorize 將 symbol 編碼為整數後穩定排序一次，再依邊界切片，
+        # 取代 groupby 建立群組物件與逐組 get_group 的成本
+        codes, symbols = pd.factorize(data['symbol'], sort=False)
+        valid_rows = np.flatnonzero(codes >= 0)  # 與 groupby 相同，略過缺失的 symbol
+        order = valid_rows[np.argsort(codes[valid_rows], kind='stable')]
+        bounds = np.flatnonzero(np.diff(codes[order])) + 1
+        row_groups = np.split(order, bounds) if len(order) else []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(writer, symbols, (data.iloc[idx] for idx in row_groups)))
+        self.logger.debug("批次寫入 %d 檔個股分區", len(symbols))
+
+    def read_chip_data(self, symbol: str, columns: Optional[List[str]] = None,
+                       start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
+        """讀取籌碼數據 (可指定欄位與日期區間，見 _read_parquet_file)"""
         file_path = self.chips_path / f"symbol={symbol}" / "data.parquet"
         if not file_path.exists():
             return pd.DataFrame()
-        return pd.read_parquet(file_path)
+        return self._read_parquet_file(file_path, columns, start_date, end_date)
+
+    def read_chip_data_batch(self, symbols: List[str], columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """批次讀取多檔股票的籌碼數據 (單次掃描，依 symbol 分區依序串接)"""
+        return self._read_symbol_partitions(self.chips_path, symbols, columns)
+
+    def _read_symbol_partitions(self, root: Path, symbols: List[str],
+                                columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        輔助函數：以單一 pyarrow Dataset 掃描多個 symbol=XXXX 分區
+
+        只列入目標股票既有的檔案 (不掃描整個目錄)，symbol 欄位由 hive 分區路徑補齊；
+        一次 to_table 讀取並只解碼指定欄位，取代逐檔 read_parquet。
+        """
+        files = [str(p) for p in (root / f"symbol={s}" / "data.parquet" for s in symbols) if p.exists()]
+        if not files:
+            return pd.DataFrame(columns=columns)
+
+        partitioning = ds.partitioning(pa.schema([('symbol', pa.string())]), flavor='hive')
+        factory = ds.FileSystemDatasetFactory(
+            pa.fs.LocalFileSystem(), files, ds.ParquetFileFormat(),
+            ds.FileSystemFactoryOptions(partition_base_dir=str(root), partitioning=partitioning)
+        )
+        # 各檔案型別可能不同 (如 int64 / double、string / large_string)，檢查所有檔案後寬鬆合併 schema
+        schema = factory.inspect(promote_options='permissive', fragments=None)
+        if columns is not None:
+            # 所有檔案皆無的欄位略過 (同 read_fundamental_data)
+            columns = [col for col in columns if col in schema.names]
+        return factory.finish(schema).to_table(columns=columns).to_pandas()
 
     def write_shareholding_data(self, symbol: str, data: pd.DataFrame):
         """寫入大戶持股數據 - 支援附加與去重"""
         path = self.shareholding_path / f"symbol={symbol}"
         path.mkdir(parents=True, exist_ok=True)
-        file_path = path / "data.parquet"
-        
-        if file_path.exists():
-            history_df = pd.read_parquet(file_path)
-            combined_df = pd.concat([history_df, data]).drop_duplicates(subset=['date'], keep='last')
-            combined_df = combined_df.sort_values('date')
-        else:
-            combined_df = data.sort_values('date')
-            
-        combined_df.to_parquet(file_path, engine='pyarrow', compression='snappy', index=False)
+        self._upsert_by_date(path / "data.parquet", data)
 
 
-    def read_shareholding_data(self, symbol: str) -> pd.DataFrame:
-        """讀取大戶持股數據"""
+    def write_shareholding_data_bulk(self, data: pd.DataFrame, max_workers: int = 8):
+        """批次寫入多檔股票的大戶持股數據"""
+        self._write_grouped_by_symbol(data, self.write_shareholding_data, max_workers)
+
+    def read_shareholding_data(self, symbol: str, columns: Optional[List[str]] = None,
+                               start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
+        """讀取大戶持股數據 (可指定欄位與日期區間，見 _read_parquet_file)"""
         file_path = self.shareholding_path / f"symbol={symbol}" / "data.parquet"
         if not file_path.exists():
             return pd.DataFrame()
-        return pd.read_parquet(file_path)
+        return self._read_parquet_file(file_path, columns, start_date, end_date)
+
+    def read_shareholding_data_batch(self, symbols: List[str], columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """批次讀取多檔股票的大戶持股數據"""
+        return self._read_symbol_partitions(self.shareholding_path, symbols, columns)
 
     def cleanup_old_data(self, keep_days: int = 30):
         """清理舊的時間分區數據"""
@@ -1,18 +1,27 @@
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 import logging
 from datetime import datetime
 from typing import Optional
+from src.utils import json_loads
 
 class ChipDataScraper:
     """
     籌碼數據爬蟲 - 抓取三大法人與集保大戶持股
     """
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None):
         self.logger = logging.getLogger(__name__)
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
+        # 共用 Session 以沿用 TWSE / TPEx / TDCC 的 TLS 連線 (HTTP keep-alive)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        self.session = session
 
     def scrape_institutional_trades(self, date_str: str) -> pd.DataFrame:
         """
@@ -34,9 +43,9 @@ class ChipDataScraper:
         url = f"https://www.twse.com.tw/rwd/zh/fund/T86?date={query_date}&selectType=ALL&response=json"
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=15)
+            response = self.session.get(url, headers=self.headers, timeout=15)
             if response.status_code != 200: return pd.DataFrame()
-            data = response.json()
+            data = json_loads(response.content)
             
             if data['stat'] != 'OK': return pd.DataFrame()
             
@@ -64,8 +73,8 @@ class ChipDataScraper:
         url = f"https://www.tpex.org.tw/web/stock/3insti/daily_trade/3itrade_hedge_result.php?l=zh-tw&o=json&se=EW&t=D&d={minguo_date}"
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=15)
-            data = response.json()
+            response = self.session.get(url, headers=self.headers, timeout=15)
+            data = json_loads(response.content)
             if not data.get('aaData'): return pd.DataFrame()
             
             df = pd.DataFrame(data['aaData'])
@@ -90,7 +99,7 @@ class ChipDataScraper:
         url = "https://opendata.tdcc.com.tw/getOD.ashx?id=1-5"
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = self.session.get(url, headers=self.headers, timeout=30)
             from io import BytesIO
             # TDCC Open Data 現在多為 UTF-8 或帶 BOM
             df = pd.read_csv(BytesIO(response.content))
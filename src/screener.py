@@ -14,6 +14,9 @@ from typing import List
 import pandas as pd
 from src.utils.stock_names import get_stock_name
 
+# 籌碼面評分所需欄位 (只讀取這些欄位)
+CHIP_COLUMNS = ['date', 'trust_net', 'foreign_net', 'dealer_net', 'total_net']
+
 
 class StockScreener:
     """
@@ -74,31 +77,39 @@ class StockScreener:
         2. 過濾「昂貴」位階（pe_score < 4，即 PE > 歷史均值）
         3. 取得分前 30 名
         """
-        results = []
-        for symbol in universe:
+        # 篩選期間每檔財報只讀取一次
+        with self.factor_engine.screening_scope():
+            # 先以批次評分一次讀入並計算所有股票，後續逐檔取詳細分數時直接命中緩存
             try:
-                # 獲取詳細因子評分
-                details = self.factor_engine.calculate_fundamental_details(symbol)
-                score = details['total_score']
-                factors = details['factors']
-
-                # 檢查 PE 位階 (Stock Level)
-                pe_score = factors.get('pe_relative', {}).get('score', 1)
-
-                # 位階過濾：只保留「便宜 (5分)」或「合理 (4分)」
-                if pe_score < 4:
-                    self.logger.debug(f"{symbol} 位階過於昂貴 (PE Score: {pe_score}), 予以過濾")
-                    continue
-
-                results.append({
-                    'symbol': symbol,
-                    'stock_name': get_stock_name(symbol),
-                    'fundamental_score': score,
-                    'pe_score': pe_score,
-                    'fundamental_details': factors  # 儲存詳細因子分數
-                })
+                self.factor_engine.calculate_fundamental_scores(universe)
             except Exception as e:
-                self.logger.error(f"Error scoring {symbol}: {e}", exc_info=True)
+                self.logger.warning(f"批次計算基本面評分失敗，改為逐檔計算: {e}")
+
+            results = []
+            for symbol in universe:
+                try:
+                    # 獲取詳細因子評分
+                    details = self.factor_engine.calculate_fundamental_details(symbol)
+                    score = details['total_score']
+                    factors = details['factors']
+
+                    # 檢查 PE 位階 (Stock Level)
+                    pe_score = factors.get('pe_relative', {}).get('score', 1)
+
+                    # 位階過濾：只保留「便宜 (5分)」或「合理 (4分)」
+                    if pe_score < 4:
+                        self.logger.debug("%s 位階過於昂貴 (PE Score: %s), 予以過濾", symbol, pe_score)
+                        continue
+
+                    results.append({
+                        'symbol': symbol,
+                        'stock_name': get_stock_name(symbol),
+                        'fundamental_score': score,
+                        'pe_score': pe_score,
+                        'fundamental_details': factors  # 儲存詳細因子分數
+                    })
+                except Exception as e:
+                    self.logger.error(f"Error scoring {symbol}: {e}", exc_info=True)
 
         df = pd.DataFrame(results)
         if df.empty: return df
@@ -125,7 +136,7 @@ class StockScreener:
             chip_details = {}
             
             # 1. 籌碼數據載入
-            chip_df = self.data_manager.read_chip_data(symbol)
+            chip_df = self.data_manager.read_chip_data(symbol, columns=CHIP_COLUMNS)
             if chip_df.empty or len(chip_df) < 5:
                 self.logger.warning(f"{symbol} 籌碼數據不足，設為 0 分")
                 chip_score = 0
@@ -157,7 +168,7 @@ class StockScreener:
             # === 因子 2: 外資持倉態度 (0-25 分) ===
             if not recent_5d.empty:
                 foreign_5d_avg = recent_5d['foreign_net'].mean()
-                foreign_latest = recent_5d.iloc[-1]['foreign_net']
+                foreign_latest = recent_5d['foreign_net'].iat[-1]
                 
                 if foreign_5d_avg > 1000 and foreign_latest > 0:
                     chip_score += 25  # 持續買超且最近仍買
@@ -205,10 +216,10 @@ class StockScreener:
                 chip_details['total_strength'] = "無數據"
             
             # === 因子 5: 大戶持股趨勢 (0-10 分) ===
-            share_df = self.data_manager.read_shareholding_data(symbol)
+            share_df = self.data_manager.read_shareholding_data(symbol, columns=['date', 'major_ratio'])
             if not share_df.empty and len(share_df) >= 2:
-                latest_ratio = share_df.iloc[-1]['major_ratio']
-                prev_ratio = share_df.iloc[-2]['major_ratio']
+                latest_ratio = share_df['major_ratio'].iat[-1]
+                prev_ratio = share_df['major_ratio'].iat[-2]
                 ratio_change = latest_ratio - prev_ratio
                 
                 if ratio_change > 0.5:
@@ -231,7 +242,7 @@ class StockScreener:
             passed.append(row)
 
             # 記錄籌碼面評分（僅供參考）
-            self.logger.info(f"{symbol} 籌碼面評分 {chip_score}/100 - {chip_details}")
+            self.logger.info("%s 籌碼面評分 %s/100 - %s", symbol, chip_score, chip_details)
 
         return pd.DataFrame(passed)
 
@@ -416,7 +427,7 @@ class StockScreener:
                         row['signal'] = 'HOLD'
 
                 # 記錄技術面評分（僅供參考，不影響是否入選）
-                self.logger.info(f"{symbol} 技術建議 {tech_score}/100 → {row['signal']} - {tech_details}")
+                self.logger.info("%s 技術建議 %s/100 → %s - %s", symbol, tech_score, row['signal'], tech_details)
                 results.append(row)
                 
             except Exception as e:
@@ -425,7 +436,7 @@ class StockScreener:
         return pd.DataFrame(results)
 
     def _calculate_bias(self, symbol: str, ma_period: int = 60) -> float:
-        df = self.data_manager.read_symbol_partition(symbol)
+        df = self.data_manager.read_symbol_partition(symbol, columns=['date', 'close'])
         if df.empty or len(df) < ma_period: return 0.0
         ma = df['close'].rolling(window=ma_period).mean().iloc[-1]
         return ((df['close'].iloc[-1] - ma) / ma) * 100
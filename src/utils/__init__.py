@@ -7,11 +7,18 @@
 - 日誌配置工具
 """
 
+import json
 import logging
 from datetime import datetime, timedelta
-from typing import List
+from typing import Any, List, Union
 import pandas as pd
 
+# orjson 為選用依賴 (C 實作，解析速度較標準庫快數倍)，未安裝時退回 json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def get_trading_days(start_date: str, end_date: str) -> List[str]:
     """取得交易日列表 (簡單版: 排除週末)"""
@@ -25,11 +32,22 @@ def setup_logging(log_level: str = 'INFO'):
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
 
+def json_loads(data: Union[bytes, str]) -> Any:
+    """解析 JSON 字串或原始 bytes (優先使用 orjson)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj: Any) -> bytes:
+    """序列化為 UTF-8 JSON bytes (優先使用 orjson，直接輸出 bytes 不經 str)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
 def load_config(config_path: str) -> dict:
     """載入 JSON 配置"""
-    import json
-    with open(config_path, 'r') as f:
-        return json.load(f)
+    with open(config_path, 'rb') as f:
+        return json_loads(f.read())
 
 
 
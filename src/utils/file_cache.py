@@ -0,0 +1,29 @@
+"""
+文字檔讀取快取工具
+
+以 (路徑, mtime) 為鍵快取檔案內容，
+同一行程內多個檢查讀取相同且未變動的檔案時只讀一次。
+"""
+
+import functools
+from pathlib import Path
+from typing import Union
+
+
+@functools.lru_cache(maxsize=256)
+def _read(path_str: str, mtime_ns: int) -> str:
+    return Path(path_str).read_text(encoding='utf-8')
+
+
+def read_text_cached(path: Union[str, Path]) -> str:
+    """
+    讀取 UTF-8 文字檔，檔案未變動 (mtime 相同) 時直接回傳快取內容
+
+    Args:
+        path: 檔案路徑
+
+    Returns:
+        檔案內容字串
+    """
+    path = Path(path).resolve()
+    return _read(str(path), path.stat().st_mtime_ns)
@@ -0,0 +1,38 @@
+"""
+TWSE 回應解析工具
+
+TWSE (如 MI_INDEX、MI_MAR_CAP) 的 JSON 回應含多個表格，
+提供共用 Session、on-demand 解析與列轉欄的 Arrow Table 轉換。
+"""
+
+import pyarrow as pa
+import requests
+from src.utils import json_loads
+
+# pysimdjson 為選用依賴：on-demand 解析，只有目標表格的 data 會轉成 Python 物件
+try:
+    import simdjson
+    _parser = simdjson.Parser()
+except ImportError:
+    simdjson = None
+
+# TWSE 請求共用的 Session，沿用 TLS 連線
+session = requests.Session()
+
+
+def parse_response(content: bytes):
+    """解析回應內容；有 simdjson 時回傳惰性代理物件，否則為一般 dict (經 json_loads)"""
+    if simdjson is not None:
+        return _parser.parse(content)
+    return json_loads(content)
+
+
+def as_list(value) -> list:
+    """將 simdjson Array 代理物件實體化為 list (一般 list 原樣回傳)"""
+    return value.as_list() if hasattr(value, 'as_list') else value
+
+
+def rows_to_table(fields: list, rows: list) -> pa.Table:
+    """將 TWSE 以列為單位的字串資料轉置為欄式 Arrow Table"""
+    columns = list(zip(*rows)) if rows else [()] * len(fields)
+    return pa.Table.from_arrays([pa.array(col, type=pa.string()) for col in columns], names=fields)
@@ -0,0 +1,42 @@
+"""
+YAML 配置快取工具
+
+以檔案 mtime 為鍵快取已解析的 YAML 內容，
+同一行程內重複載入相同且未變動的配置檔時免去重新解析。
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Tuple, Union
+import yaml
+
+# libyaml C 綁定的 CSafeLoader 解析速度約為純 Python SafeLoader 的 3 倍，未安裝 libyaml 時退回
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# {絕對路徑: (mtime_ns, 解析結果)}
+_cache: Dict[Path, Tuple[int, Any]] = {}
+
+
+def load_yaml_cached(path: Union[str, Path]) -> Any:
+    """
+    載入 YAML 檔案，檔案未變動 (mtime 相同) 時直接回傳快取結果
+
+    Args:
+        path: YAML 檔案路徑
+
+    Returns:
+        解析後的內容 (呼叫端請勿就地修改，快取間共用同一物件)
+    """
+    path = Path(path).resolve()
+    mtime_ns = path.stat().st_mtime_ns
+
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    with open(path, 'rb') as f:
+        data = yaml.load(f, Loader=SafeLoader)
+    _cache[path] = (mtime_ns, data)
+    return data
@@ -51,6 +51,9 @@ class TestFactorEngine:
             'date': pd.date_range('2024-01-01', periods=365),
             'close': np.linspace(50, 70, 365)  # 價格從 50 漸增至 70
         })
+        manager.read_prices_bulk.side_effect = lambda symbols: pd.concat(
+            [manager.read_symbol_partition(s).assign(symbol=s) for s in symbols], ignore_index=True
+        )
         
         return manager
 
@@ -346,6 +349,100 @@ class TestFactorEngine:
         # 實際分數取決於因子計算的降級邏輯
         assert 40 <= score <= 200  # 驗證範圍即可
 
+    def test_calculate_fundamental_scores_批次與單檔一致(self, factor_engine, mock_data_manager):
+        """測試批次評分 - 結果與逐檔計算一致，且寫入相同緩存"""
+        single_df = mock_data_manager.read_fundamental_data.return_value
+        short_df = single_df.tail(3)
+        mock_data_manager.read_fundamental_data_bulk.return_value = pd.concat([
+            single_df.assign(symbol='2330'),
+            short_df.assign(symbol='2317'),
+        ])
+
+        scores = factor_engine.calculate_fundamental_scores(['2330', '2317', 'NONE'])
+
+        expected_engine = FactorEngine(data_manager=mock_data_manager)
+        for symbol, df in [('2330', single_df), ('2317', short_df), ('NONE', pd.DataFrame())]:
+            mock_data_manager.read_fundamental_data.return_value = df
+            assert scores[symbol] == pytest.approx(expected_engine.calculate_fundamental_score(symbol))
+
+        from datetime import date
+        assert f"2330_fundamental_{date.today()}_details" in factor_engine.cache
+
+    def test_calculate_fundamental_scores_parallel_與單檔一致(self, factor_engine, mock_data_manager):
+        """測試並行評分 - 結果與逐檔計算一致，重複代碼只計算一次"""
+        symbols = ['2330', '2317', '2454', '2330']
+        scores = factor_engine.calculate_fundamental_scores_parallel(symbols, max_workers=4)
+
+        assert list(scores) == ['2330', '2317', '2454']
+        expected = FactorEngine(data_manager=mock_data_manager).calculate_fundamental_score('2330')
+        assert all(score == pytest.approx(expected) for score in scores.values())
+
+    def test_calculate_fundamental_score_自訂註冊因子(self, factor_engine, mock_data_manager):
+        """測試註冊策略 - 批次核心以外的因子逐檔呼叫其計算函數並納入加權"""
+        base = FactorEngine(data_manager=mock_data_manager).calculate_fundamental_score('2330')
+        factor_engine.weights = {**factor_engine.weights, 'custom': 0.1, 'broken': 0.1}
+        factor_engine.fundamental_factors['custom'] = Mock(return_value=42.0)
+        factor_engine.fundamental_factors['broken'] = Mock(side_effect=ValueError('boom'))
+
+        score = factor_engine.calculate_fundamental_score('2330')
+        details = factor_engine.calculate_fundamental_details('2330')['factors']
+
+        factor_engine.fundamental_factors['custom'].assert_called_once_with('2330')
+        # 無評分規則的因子給 3 分，計算失敗給 1 分
+        assert score == pytest.approx(base + (3 * 0.1 + 1 * 0.1) * 40)
+        assert details['custom']['raw_value'] == 42.0 and details['custom']['score'] == 3
+        assert details['broken']['raw_value'] is None and details['broken']['score'] == 1
+
+    def test_screening_scope_每檔只讀一次(self, factor_engine, mock_data_manager):
+        """測試篩選區塊 - 區塊內重複取用同檔財報只讀取一次，離開後清除"""
+        with factor_engine.screening_scope():
+            factor_engine._calculate_roe('2330')
+            factor_engine._calculate_gross_margin_trend('2330')
+            factor_engine._calculate_fcf('2330')
+        assert mock_data_manager.read_fundamental_data.call_count == 1
+        assert 'margin' not in mock_data_manager.read_fundamental_data.return_value.columns
+
+        factor_engine._calculate_roe('2330')
+        assert mock_data_manager.read_fundamental_data.call_count == 2
+
+    def test_score_store_跨實例沿用(self, mock_data_manager, tmp_path):
+        """測試分數儲存 - 數據未變動時新實例直接取用儲存結果，數據變動後重新計算"""
+        store_path = tmp_path / 'factor_scores.parquet'
+        engine = FactorEngine(data_manager=mock_data_manager, score_store_path=store_path)
+        score = engine.calculate_fundamental_score('2330')
+        engine.flush_cache()
+        assert store_path.exists()
+
+        reloaded = FactorEngine(data_manager=mock_data_manager, score_store_path=store_path)
+        with patch.object(FactorEngine, '_compute_raw_factors', side_effect=AssertionError('不應重新計算')):
+            assert reloaded.calculate_fundamental_score('2330') == pytest.approx(score)
+
+        changed = mock_data_manager.read_fundamental_data.return_value.copy()
+        changed['net_income'] = changed['net_income'] * 2
+        mock_data_manager.read_fundamental_data.return_value = changed
+        with patch.object(FactorEngine, '_compute_raw_factors', wraps=reloaded._compute_raw_factors) as compute:
+            reloaded.cache.clear()
+            reloaded.calculate_fundamental_score('2330')
+            assert compute.call_count == 1
+
+    def test_compute_raw_factors_JIT與NumPy一致(self):
+        """測試數值核心 - JIT 版本 (若已安裝 numba) 與 NumPy 版本結果一致"""
+        from src.factors_jit import compute_raw_factors, _compute_raw_factors_numpy
+
+        rng = np.random.default_rng(0)
+        n_symbols = 200
+        n_rows = rng.integers(0, 8, n_symbols)
+        has = rng.random((n_symbols, 9)) > 0.1
+        windows = rng.normal(50, 100, (9, n_symbols, 5))
+        windows[rng.random(windows.shape) < 0.1] = np.nan
+        windows[:, ::17] = 0.0
+
+        raw, roe_failed = compute_raw_factors(n_rows, has, *windows)
+        expected_raw, expected_failed = _compute_raw_factors_numpy(n_rows, has, *windows)
+
+        np.testing.assert_allclose(raw, expected_raw, rtol=1e-12, equal_nan=True)
+        np.testing.assert_array_equal(roe_failed, expected_failed)
+
     # ==================== 邊界情況測試 ====================
 
     def test_極端正值(self, factor_engine, mock_data_manager):
@@ -0,0 +1,168 @@
+"""
+ParquetManager 單元測試
+
+以實際寫出的個股分區檔驗證：
+- 時間分區寫入與讀取往返 (字串與 datetime 日期)
+- 日期區間讀取下推至 pyarrow (row group 統計值略過範圍外資料)
+- 依日期附加 (_upsert_by_date) 只重寫與新數據重疊的 row group
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import pyarrow.parquet as pq
+from unittest.mock import patch
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.parquet_manager import ParquetManager, SYMBOL_ROW_GROUP_SIZE
+
+
+def _history(start: str, periods: int, close_offset: float = 0.0) -> pd.DataFrame:
+    """逐日價格數據 (日期為字串)"""
+    return pd.DataFrame({
+        'date': pd.date_range(start, periods=periods).strftime('%Y-%m-%d'),
+        'close': np.arange(periods, dtype=np.float64) + close_offset,
+        'volume': np.arange(periods, dtype=np.int64) * 1000,
+    })
+
+
+class TestParquetManager:
+    """ParquetManager 測試套件"""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        return ParquetManager(base_path=str(tmp_path))
+
+    @staticmethod
+    def _daily(date_str: str, as_datetime: bool) -> pd.DataFrame:
+        """單日多檔股票行情"""
+        df = pd.DataFrame({
+            'date': [date_str] * 3,
+            'symbol': ['2330', '2317', '2454'],
+            'close': [600.0, 100.0, 900.0],
+        })
+        if as_datetime:
+            df['date'] = pd.to_datetime(df['date'])
+        return df
+
+    @pytest.mark.parametrize('as_datetime', [False, True])
+    def test_read_time_partition_寫入讀取往返(self, manager, as_datetime):
+        """檔內 date 欄位為字串或 datetime 時皆可讀回，日期統一為字串"""
+        for date_str in ('2024-01-02', '2024-01-03', '2024-01-04'):
+            manager.write_time_partition(self._daily(date_str, as_datetime), date_str)
+
+        result = manager.read_time_partition('2024-01-03', '2024-01-04')
+
+        assert result['date'].tolist() == ['2024-01-03'] * 3 + ['2024-01-04'] * 3
+        assert result['symbol'].tolist() == ['2330', '2317', '2454'] * 2
+        assert manager.read_time_partition('2024-01-02', columns=['symbol', 'close'])['close'].tolist() == [600.0, 100.0, 900.0]
+        assert manager.read_time_partition('2024-02-01').empty
+
+    def test_read_time_partition_混合日期型別(self, manager):
+        manager.write_time_partition(self._daily('2024-01-02', as_datetime=True), '2024-01-02')
+        manager.write_time_partition(self._daily('2024-01-03', as_datetime=False), '2024-01-03')
+
+        result = manager.read_time_partition('2024-01-01', '2024-01-31', columns=['date', 'close'])
+
+        assert result['date'].tolist() == ['2024-01-02'] * 3 + ['2024-01-03'] * 3
+        assert list(result.columns) == ['date', 'close']
+
+    def test_read_symbol_partition_日期區間下推過濾(self, manager):
+        """write_symbol_partition 寫出的檔案，日期條件以 filters 交給 pyarrow"""
+        df = _history('2024-01-01', 300)
+        manager.write_symbol_partition(df.copy(), '2330')
+
+        with patch('src.parquet_manager.pq.read_table', wraps=pq.read_table) as read_table:
+            result = manager.read_symbol_partition('2330', start_date='2024-06-01', end_date='2024-06-30')
+
+        assert read_table.call_args.kwargs['filters'] == [('date', '>=', '2024-06-01'), ('date', '<=', '2024-06-30')]
+        expected = df[(df['date'] >= '2024-06-01') & (df['date'] <= '2024-06-30')].reset_index(drop=True)
+        assert len(result) == 30
+        assert result['date'].astype(str).tolist() == expected['date'].tolist()
+        assert result['close'].tolist() == expected['close'].tolist()
+
+    def test_read_symbol_partition_只指定起始日(self, manager):
+        manager.write_symbol_partition(_history('2024-01-01', 100), '2330')
+
+        result = manager.read_symbol_partition('2330', columns=['date', 'close'], start_date='2024-04-01')
+
+        assert result['date'].astype(str).tolist() == pd.date_range('2024-04-01', '2024-04-09').strftime('%Y-%m-%d').tolist()
+        assert list(result.columns) == ['date', 'close']
+
+    @staticmethod
+    def _row_group_sizes(file_path: Path) -> list:
+        metadata = pq.ParquetFile(file_path).metadata
+        return [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+
+    @staticmethod
+    def _upsert_expected(history: pd.DataFrame, new_data: pd.DataFrame) -> pd.DataFrame:
+        """舊版整檔讀取合併的結果 (同日期以新數據為準)"""
+        combined = pd.concat([history, new_data]).drop_duplicates(subset=['date'], keep='last')
+        return combined.sort_values('date').reset_index(drop=True)
+
+    def _assert_upsert(self, manager, history, new_data, fast_path=True):
+        """經 write_symbol_partition 寫入後以 _append_to_history 附加，比對結果與讀取路徑"""
+        manager.write_symbol_partition(history.copy(), '2330')
+        file_path = manager.history_path / 'symbol=2330' / 'data.parquet'
+
+        with patch('src.parquet_manager.pd.read_parquet', wraps=pd.read_parquet) as read_parquet:
+            manager._append_to_history('2330', new_data.copy())
+        assert read_parquet.called != fast_path
+
+        result = pd.read_parquet(file_path)
+        result['date'] = result['date'].astype(str)
+        expected = self._upsert_expected(history, new_data)
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_like=True)
+        return self._row_group_sizes(file_path)
+
+    def test_append_to_history_最後一組已滿(self, manager):
+        """已滿的 row group 原樣保留，新數據另成一組"""
+        history = _history('2024-01-01', 2 * SYMBOL_ROW_GROUP_SIZE)
+        sizes = self._assert_upsert(manager, history, _history('2024-05-08', 1, close_offset=1000))
+
+        assert sizes == [SYMBOL_ROW_GROUP_SIZE, SYMBOL_ROW_GROUP_SIZE, 1]
+
+    def test_append_to_history_最後一組未滿(self, manager):
+        """未滿的最後一組與新數據合併重寫，不產生零碎的小 row group"""
+        history = _history('2024-01-01', 100)
+        sizes = self._assert_upsert(manager, history, _history('2024-04-10', 2, close_offset=1000))
+
+        assert sizes == [SYMBOL_ROW_GROUP_SIZE, 38]
+
+    def test_append_to_history_日期與尾段重疊(self, manager):
+        """重疊日期以新數據覆寫，之前的 row group 不受影響"""
+        history = _history('2024-01-01', 200)
+        new_data = _history('2024-07-01', 30, close_offset=1000)  # 與最後 18 天重疊
+        sizes = self._assert_upsert(manager, history, new_data)
+
+        assert sizes == [SYMBOL_ROW_GROUP_SIZE] * 3 + [20]
+
+    def test_append_to_history_datetime日期(self, manager):
+        """每日分區的 datetime 日期轉為字串後同樣走 row group 附加路徑"""
+        history = _history('2024-01-01', 100)
+        new_data = _history('2024-04-10', 1, close_offset=1000)
+        manager.write_symbol_partition(history.copy(), '2330')
+
+        manager._append_to_history('2330', new_data.assign(date=pd.to_datetime(new_data['date'])))
+
+        result = manager.read_symbol_partition('2330')
+        assert result['date'].iloc[-1] == '2024-04-10'
+        assert len(result) == 101
+
+    def test_append_to_history_欄位不一致退回整檔合併(self, manager):
+        history = _history('2024-01-01', 100)
+        new_data = _history('2024-04-10', 1, close_offset=1000).assign(amount=1.0)
+        self._assert_upsert(manager, history, new_data, fast_path=False)
+
+    def test_write_chip_data_附加去重(self, manager):
+        """籌碼與大戶持股寫入共用 _upsert_by_date"""
+        chips = _history('2024-01-01', 100).rename(columns={'close': 'total_net'})
+        manager.write_chip_data('2330', chips.copy())
+        manager.write_chip_data('2330', _history('2024-04-09', 3, close_offset=1000).rename(columns={'close': 'total_net'}))
+
+        result = manager.read_chip_data('2330', columns=['date', 'total_net'])
+        assert len(result) == 102
+        assert result['total_net'].tolist()[-3:] == [1000.0, 1001.0, 1002.0]
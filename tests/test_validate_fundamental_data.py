@@ -0,0 +1,151 @@
+"""
+FundamentalDataValidator 單元測試
+
+以 ParquetManager.write_fundamental_data 實際寫出的檔案驗證：
+- footer 統計值快速路徑與完整讀取路徑的判定一致
+- 異常計數核心 (Numba / NumPy) 結果一致
+- 多行程驗證與循序驗證結果一致
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from unittest.mock import patch
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.parquet_manager import ParquetManager
+from scripts.validate_fundamental_data import (
+    FundamentalDataValidator, _count_anomalies, _count_anomalies_numpy
+)
+
+
+def _fundamentals(periods: int = 8, start: str = '2023-03-31') -> pd.DataFrame:
+    """標準財報數據 (無缺失、無異常)"""
+    base = np.arange(periods, dtype=np.float64)
+    return pd.DataFrame({
+        'date': pd.date_range(start, periods=periods, freq='QE').strftime('%Y-%m-%d'),
+        'revenue': 10000 + 500 * base,
+        'gross_profit': 3000 + 100 * base,
+        'operating_income': 2000 + 80 * base,
+        'net_income': 1000 + 50 * base,
+        'eps': 2.0 + 0.1 * base,
+        'equity': 5000 + 200 * base,
+        'total_assets': 10000 + 400 * base,
+        'total_liabilities': 5000 + 200 * base,
+        'operating_cash_flow': 1500 + 60 * base,
+        'capital_expenditure': 500 + 20 * base,
+    })
+
+
+def _with(df: pd.DataFrame, column: str, values) -> pd.DataFrame:
+    df = df.copy()
+    df[column] = values
+    return df
+
+
+CASES = {
+    '正常': _fundamentals(),
+    '過期日期': _fundamentals(start='2012-03-31'),
+    '必要欄位缺值': _with(_fundamentals(), 'eps', [2.0, np.nan, 2.2, 2.3, 2.4, 2.5, 2.6, 2.7]),
+    '建議欄位過半缺值': _with(_fundamentals(), 'capital_expenditure', [np.nan] * 5 + [1.0, 2.0, 3.0]),
+    '建議欄位少量缺值': _with(_fundamentals(), 'gross_profit', [np.nan] + [3000.0] * 7),
+    '負營收': _with(_fundamentals(), 'revenue', [-1.0] + [10000.0] * 7),
+    '極端EPS': _with(_fundamentals(), 'eps', [150.0] + [2.0] * 7),
+    '缺少必要欄位': _fundamentals().drop(columns='total_assets'),
+    '季度不足': _fundamentals(periods=3),
+}
+
+
+class TestFundamentalDataValidator:
+    """FundamentalDataValidator 測試套件"""
+
+    @pytest.fixture
+    def validator(self, tmp_path):
+        manager = ParquetManager(base_path=str(tmp_path))
+        for i, df in enumerate(CASES.values()):
+            manager.write_fundamental_data(df.copy(), f'{1000 + i}')
+        return FundamentalDataValidator(manager)
+
+    @staticmethod
+    def _normalize(result: dict) -> dict:
+        return {**result,
+                'missing_required': sorted(result['missing_required']),
+                'missing_recommended': sorted(result['missing_recommended'])}
+
+    @pytest.mark.parametrize('case', [c for c in CASES if c != '季度不足'])
+    def test_validate_stock_footer與完整讀取判定一致(self, validator, case):
+        """
+        footer 快速路徑成立時，結果須與強制完整讀取相同
+
+        季度不足者在 _validate_from_metadata 之前即提前返回，另以下方測試驗證。
+        """
+        symbol = f'{1000 + list(CASES).index(case)}'
+        fast = validator.validate_stock(symbol)
+        with patch.object(FundamentalDataValidator, '_validate_from_metadata', return_value=False):
+            full = validator.validate_stock(symbol)
+
+        assert self._normalize(fast) == self._normalize(full)
+
+    def test_validate_stock_季度不足提前返回與完整讀取判定一致(self, validator):
+        """footer 列數不足時不讀資料頁；強制完整讀取時同樣判定無效，只差在異常說明"""
+        symbol = f'{1000 + list(CASES).index("季度不足")}'
+        with patch.object(validator.data_manager, 'read_fundamental_data',
+                          wraps=validator.data_manager.read_fundamental_data) as read:
+            early = validator.validate_stock(symbol)
+        read.assert_not_called()
+
+        # 門檻設為 0 以略過提前返回，並停用統計值路徑，強制走完整讀取
+        min_quarters = FundamentalDataValidator.MIN_QUARTERS
+        with patch.object(FundamentalDataValidator, 'MIN_QUARTERS', 0), \
+                patch.object(FundamentalDataValidator, '_validate_from_metadata', return_value=False):
+            full = validator.validate_stock(symbol)
+
+        # 完整讀取除季度數外無其他問題：在原門檻下唯一的無效原因即為季度不足，與提前返回一致
+        assert early['quarters'] == full['quarters'] == 3 < min_quarters
+        assert not early['valid']
+        assert early['anomalies'] == ['Insufficient data: 3 quarters']
+        assert full['missing_required'] == [] and full['anomalies'] == []
+
+    def test_validate_stock_無缺失無異常時只讀footer(self, validator):
+        """正常與過期日期的檔案以統計值即可判定，不讀資料頁"""
+        with patch.object(validator.data_manager, 'read_fundamental_data') as read:
+            normal = validator.validate_stock('1000')
+            stale = validator.validate_stock('1001')
+
+        read.assert_not_called()
+        assert normal['valid'] and stale['valid']
+        assert stale['date_range'] == ('2012-03-31', '2013-12-31')
+
+    def test_validate_stock_缺值與異常的判定(self, validator):
+        results = {case: validator.validate_stock(f'{1000 + i}') for i, case in enumerate(CASES)}
+
+        assert not results['必要欄位缺值']['valid']
+        assert results['建議欄位過半缺值']['valid']
+        assert any('capital_expenditure' in a for a in results['建議欄位過半缺值']['anomalies'])
+        assert results['建議欄位少量缺值']['anomalies'] == []
+        assert not results['負營收']['valid']
+        assert results['極端EPS']['valid']
+        assert results['缺少必要欄位']['missing_required'] == ['total_assets']
+        assert results['季度不足']['quarters'] == 3 and not results['季度不足']['valid']
+
+    def test_validate_all_多行程與循序一致(self, validator):
+        parallel = validator.validate_all(max_workers=2)
+        parallel_results = validator.validation_results
+        sequential = validator.validate_all(max_workers=1)
+
+        assert parallel == sequential
+        assert ([self._normalize(r) for r in parallel_results]
+                == [self._normalize(r) for r in validator.validation_results])
+
+    def test_count_anomalies_JIT與NumPy一致(self):
+        rng = np.random.default_rng(0)
+        arrays = [rng.normal(0, 80, 200) for _ in range(4)]
+        for arr in arrays:
+            arr[rng.integers(0, 200, 20)] = np.nan
+
+        assert _count_anomalies(*arrays) == _count_anomalies_numpy(*arrays)
+        empty = np.empty(0, dtype=np.float64)
+        assert _count_anomalies(empty, empty, empty, empty) == (0, 0, 0, 0)